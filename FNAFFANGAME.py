@@ -1,160 +1,97 @@
+from startup import StartupTimer, Prefetcher  # Import the startup timing and background loading helpers
+startup_timer = StartupTimer()  # Started before the other imports so they are timed too
 from settings import *  # Import all constants and libraries from settings.py
-
-class Enemy:
-    def __init__(self, screen_name, jumpscare_image=None):
-        self.screen_name = screen_name  # Screen name where the enemy appears
-        self.jumpscare_image = jumpscare_image  # Image for the jumpscare animation
-        self.active = False  # Whether the enemy is active
-        self.cooldown = random.randint(10000, 20000)  # Cooldown time before the enemy can spawn again
-        self.last_spawn_time = 0  # Last time the enemy was spawned
-        self.spawn_time = 0  # Time when the enemy was spawned
-        self.spawn_duration = 10000  # Duration the enemy stays active
-        self.jumpscare_frames = []  # List to store jumpscare frames
-        self.jumpscare_played = False  # Track if jumpscare has been played
-        self.load_jumpscare_frames()  # Load jumpscare frames
-        self.jumpscare_sound = None  # Jumpscare sound effect
-        self.load_jumpscare_sound()  # Load jumpscare sound
-
-    def spawn(self):
-        """Spawn the enemy at a random location."""
-        if not self.active and pygame.time.get_ticks() - self.last_spawn_time > self.cooldown:
-            self.active = True  # Activate the enemy
-            self.spawn_time = pygame.time.get_ticks()  # Record the spawn time
-
-    def despawn(self):
-        """Despawn the enemy."""
-        self.active = False  # Deactivate the enemy
-        self.last_spawn_time = pygame.time.get_ticks()  # Record the last spawn time
-
-    def update(self):
-        """Automatically despawn the enemy after its duration."""
-        if self.active and pygame.time.get_ticks() - self.spawn_time > self.spawn_duration:
-            if not self.jumpscare_played:
-                self.trigger_jumpscare()  # Trigger the jumpscare
-                self.jumpscare_played = True  # Mark the jumpscare as played
-
-    def draw_indicator(self):
-        """Draw an image on the respective screen."""
-        if self.active:
-            if self.screen_name == "left":
-                indicator_image = pygame.image.load("images/BB.png").convert_alpha()  # Load the indicator image
-            elif self.screen_name == "right":
-                indicator_image = pygame.image.load("images/toy_bonnie.png").convert_alpha()  # Load the indicator image
-            indicator_image = pygame.transform.scale(indicator_image, (SCREEN_WIDTH, SCREEN_HEIGHT))  # Scale the image to fit the screen
-            screen.blit(indicator_image, (0, 0))  # Draw the image on the screen
-
-    def trigger_jumpscare(self):
-        """Display an animated jumpscare and end the game."""
-        if self.jumpscare_frames:
-            if self.jumpscare_sound and not self.jumpscare_played:
-                self.jumpscare_sound.play()  # Play the jumpscare sound effect if loaded and not already played
-            for frame in self.jumpscare_frames:
-                screen.blit(frame, (0, 0))  # Draw each frame on the screen
-                pygame.display.flip()  # Update the display
-                pygame.time.delay(20)  # Delay for smooth animation
-
-            screen.blit(self.jumpscare_frames[-1], (0, 0))  # Draw the last frame
-            pygame.display.flip()  # Update the display
-            pygame.time.delay(3000)  # Delay for 3 seconds
-        else:
-            jumpscare_image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))  # Create a surface for the jumpscare
-            jumpscare_image.fill(RED)  # Fill the surface with red color
-            screen.blit(jumpscare_image, (0, 0))  # Draw the surface on the screen
-            pygame.display.flip()  # Update the display
-            pygame.time.delay(3000)  # Delay for 3 seconds
-        self.game_over_screen()  # Display the game over screen
+import os  # Import the os library
+import time  # Import the time library
+from jumpscare import JumpscarePlayer  # Import the jumpscare frame streamer
+from simulation import Animatronic, Simulation, TickClock, TICK_MS  # Import the game rules
+from scenes import Scene, JumpscareScene, WinScene, GameOverScene  # Import the jumpscare, win and game over screens
+from replay import Recorder  # Import the input recorder
+from atlas import SpriteAtlas  # Import the sprite atlas packer
+from renderer import DrawList  # Import the batched draw list
+
+class Enemy(Animatronic):
+    __slots__ = ("indicator_image", "flashlight_image", "jumpscare_image", "jumpscare_sound_path", "jumpscare", "jumpscare_loaded", "load_lock")
+
+    def __init__(self, entry):
+        super().__init__(entry["camera"], name=entry["name"])  # Spawn and jumpscare timing
+        self.indicator_image = entry["indicator"]  # Image shown on its camera
+        self.flashlight_image = entry["flashlight"]  # Image shown when the flashlight is on it
+        self.jumpscare_image = entry["jumpscare"]  # Sprite sheet for the jumpscare animation
+        self.jumpscare_sound_path = entry.get("sound")  # Sound played with the jumpscare
+        self.jumpscare = None  # Player that streams the jumpscare frames
+        self.jumpscare_loaded = False  # Whether the jumpscare frames and sound were loaded
+        self.load_lock = threading.Lock()  # The prefetch thread and the game may both ask for the jumpscare
+
+    def load_jumpscare(self):
+        """Load the jumpscare frames and sound the first time they are needed (or prefetched)."""
+        with self.load_lock:  # Waits for the prefetch thread if it is loading them right now
+            if not self.jumpscare_loaded:
+                self.load_jumpscare_frames()  # Load jumpscare frames
+                self.load_jumpscare_sound()  # Load jumpscare sound
+                self.jumpscare_loaded = True
 
     def load_jumpscare_frames(self):
-        """Load jumpscare frames from sprite sheet."""
+        """Prepare the jumpscare player for the sprite sheet."""
         if self.jumpscare_image:
+            if self.jumpscare_image not in JUMPSCARE_SHEETS:
+                print(f"Unknown jumpscare image: {self.jumpscare_image}")
+                return
+            cols, rows, total_frames = JUMPSCARE_SHEETS[self.jumpscare_image]  # Columns, rows and number of frames in the sprite sheet
             try:
-                if self.jumpscare_image == "images/BBjumpscare.png":
-                    sheet = pygame.image.load(self.jumpscare_image).convert_alpha()  # Load the sprite sheet
-                    sheet_width, sheet_height = sheet.get_size()  # Get the size of the sprite sheet
-                    cols, rows = 5, 10  # Number of columns and rows in the sprite sheet
-                    total_frames = 51  # Total number of frames
-                elif self.jumpscare_image == "images/toy_bonniejumpscare.png":
-                    sheet = pygame.image.load(self.jumpscare_image).convert_alpha()  # Load the sprite sheet
-                    sheet_width, sheet_height = sheet.get_size()  # Get the size of the sprite sheet
-                    cols, rows = 5, 9  # Number of columns and rows in the sprite sheet
-                    total_frames = 41  # Total number of frames
-                else:
-                    print(f"Unknown jumpscare image: {self.jumpscare_image}")
-                    return
-                frame_width = sheet_width // cols  # Width of each frame
-                frame_height = sheet_height // rows  # Height of each frame
-
-                for row in range(rows):
-                    for col in range(cols):
-                        if len(self.jumpscare_frames) < total_frames:
-                            frame_rect = pygame.Rect(col * frame_width, row * frame_height, frame_width, frame_height)  # Rectangle representing the frame
-                            frame = sheet.subsurface(frame_rect)  # Extract the frame from the sprite sheet
-                            scaled_frame = pygame.transform.scale(frame, (SCREEN_WIDTH, SCREEN_HEIGHT))  # Scale the frame to fit the screen
-                            self.jumpscare_frames.append(scaled_frame)  # Add the frame to the list
-            except pygame.error as e:
+                # Frames are taken from the asset pack, or decoded and scaled just before they are shown, unless eager mode is on
+                self.jumpscare = JumpscarePlayer(self.jumpscare_image, cols, rows, total_frames, (SCREEN_WIDTH, SCREEN_HEIGHT),
+                                                 eager=JUMPSCARE_EAGER, buffer_size=JUMPSCARE_BUFFER_FRAMES, pack=asset_cache.pack)
+            except (pygame.error, FileNotFoundError) as e:
                 print(f"Error loading jumpscare frames: {e}")
 
     def load_jumpscare_sound(self):
-        """Load the jumpscare sound effect."""
-        if self.jumpscare_image == "images/BBjumpscare.png":
-            self.jumpscare_sound = pygame.mixer.Sound("sound/BBjumpscaresound.wav")  # Load the jumpscare sound effect
-        elif self.jumpscare_image == "images/toy_bonniejumpscare.png":
-            self.jumpscare_sound = pygame.mixer.Sound("sound/bonniejumpscaresound.wav")  # Load the jumpscare sound effect
+        """Decode the jumpscare sound effect so it starts without delay."""
+        if self.jumpscare_sound_path:
+            audio.load(self.jumpscare_sound_path)  # Decode the jumpscare sound effect
         else:
-            print(f"Unknown jumpscare image: {self.jumpscare_image}")
-            self.jumpscare_sound = None  # Set to None if unknown image
-
-    def game_over_screen(self):
-        """Display a game over screen with retry and placeholder for main menu."""
-        font_large = pygame.font.Font('font/minecraft.ttf', 100)  # Load a large font
-        font_small = pygame.font.Font('font/minecraft.ttf', 50)  # Load a small font
-
-        game_over = True
-        while game_over:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()  # Quit the game
-                    exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        game_over = False  # Exit the game over screen
-                        restart_dinosaur_game()  # Restart the game
-
-            screen.fill(BLACK)  # Fill the screen with black color
-            game_over_text = font_large.render("GAME OVER", True, RED)  # Render the game over text
-            retry_text = font_small.render("Press R to Retry", True, WHITE)  # Render the retry text
-            screen.blit(game_over_text, game_over_text.get_rect(center=(gameover_x,gameover_y)))  # Draw the game over text
-            screen.blit(retry_text, retry_text.get_rect(center=(retry_x,retry_y)))  # Draw the retry text
-            pygame.display.flip()  # Update the display
-
-# Create two enemies
-red_enemy = Enemy("left", "images/BBjumpscare.png")  # Create a red enemy
-blue_enemy = Enemy("right", "images/toy_bonniejumpscare.png")  # Create a blue enemy
-
-def load_dino_sprite_sheet():
-    """Load the dinosaur sprite sheet and extract frames for running and jumping."""
-    sheet = pygame.image.load(sprite_sheet_path).convert_alpha()  # Load the sprite sheet
-    sprite_width = sheet.get_width() // 5  # 5 columns in the sprite sheet
-    sprite_height = sheet.get_height() // 7  # 7 rows in the sprite sheet
-    running_frames = []
+            print(f"No jumpscare sound for {self.name}")
 
-    # Extract frames for running (top row)
-    for i in range(5):
-        frame = sheet.subsurface((i * sprite_width, 0, sprite_width, sprite_height))  # Extract frame
-        running_frames.append(pygame.transform.scale(frame, (DINOSAUR_WIDTH, DINOSAUR_HEIGHT)))  # Scale and add to list
+# Create the enemies listed in the roster (enemies.json)
+enemies = [Enemy(entry) for entry in ENEMY_ROSTER]
 
-    # Extract frame for jumping (bottom-left frame)
-    jump_frame = sheet.subsurface((0, 6 * sprite_height, sprite_width, sprite_height))  # Extract frame
-    jump_frame = pygame.transform.scale(jump_frame, (DINOSAUR_WIDTH, DINOSAUR_HEIGHT))  # Scale the frame
+# Game rules, stepped at a fixed rate by main() and drawn after each frame
+game = Simulation(enemies=enemies, clock=TickClock(), profiler=profiler if PROFILE else None)
+dino = game.dino  # Dinosaur hitbox
 
-    return running_frames, jump_frame  # Return the frames
+screen = None  # Game screen, opened by init()
+draw_list = DrawList(renderer, batch=BATCH_BLITS)  # Everything drawn in a frame, sent to the screen in one call (gets the atlas in init())
+recorder = None  # Input recorder of the current night, started by main()
+fullscreen = FULLSCREEN  # Whether the window is fullscreen, switched with FULLSCREEN_KEY
+running_frames, jump_frame = [], None  # Dinosaur animation frames, loaded by init()
 
-running_frames, jump_frame = load_dino_sprite_sheet()  # Load the frames
+def load_dino_sprite_sheet():
+    """Load the running and jumping frames of the dinosaur sprite sheet."""
+    frames = asset_cache.load_frames(sprite_sheet_path, DINO_SHEET_GRID, DINO_RUN_FRAMES + [DINO_JUMP_FRAME], (DINOSAUR_WIDTH, DINOSAUR_HEIGHT))
+    return frames[:-1], frames[-1]  # Running frames (top row) and the jump frame (bottom-left)
+
+def obstacle_image(height, alpha):
+    """Return the obstacle image scaled to the obstacle height with its transparency applied."""
+    if alpha >= 255:
+        return asset_cache.load("images/obstacle.png", (OBSTACLE_WIDTH, height))  # Fully opaque: the image packed in the atlas
+    return asset_cache.load_faded("images/obstacle.png", (OBSTACLE_WIDTH, height), alpha, FADE_RAMP_STEP)  # Closest image of its fade ramp
+
+def fade_ramps():
+    """Return every faded obstacle image, baking the fade ramps the first time."""
+    return [image for path, size, _ in OBSTACLE_IMAGES for image in asset_cache.load_fade_ramp(path, size, FADE_RAMP_STEP)]
+
+def camera_layers(watching, flashlight):
+    """Return the images a side camera shows, bottom first: the enemies on it, then the flashlight view."""
+    layers = [(enemy.indicator_image, (SCREEN_WIDTH, SCREEN_HEIGHT), True) for enemy in watching]
+    if flashlight:
+        # The flashlight shows the enemy it chases away, or the empty camera
+        layers.append((watching[0].flashlight_image, (SCREEN_WIDTH, SCREEN_HEIGHT), True) if watching else NO_ENEMY_FLASHLIGHT_IMAGE)
+    return layers
 
 def update_dino_animation():
     """Update Dino animation based on running or jumping state."""
     global current_frame_index, animation_timer
-    if jumping:
+    if game.jumping:
         # If the dinosaur is jumping, return the jump frame
         return jump_frame
     else:
@@ -166,233 +103,232 @@ def update_dino_animation():
             animation_timer = 0  # Reset the animation timer
         return running_frames[current_frame_index]  # Return the current running frame based on the frame index
 
-def wingamecondition():
-    if score >= 143:  # Check if the score reaches 143
-        return True  # End the game if the score reaches 143
-    return False  # Continue the game
-
 def restart_dinosaur_game():
     """Reset the game variables."""
-    global dino_game_active, score, obstacles, jumping, velocity_y, dino_paused, current_pov
-    global hours, game_start_time, current_time_label, dinosaur_y
-    # Reset variables
-    dino_game_active = True
-    score = 0
-    hours = 12
-    obstacles = []
-    jumping = False
-    velocity_y = 0
-    dino_paused = False
-    current_pov = "center"
-    dino.y = dinosaur_y
-    red_enemy.despawn()
-    blue_enemy.despawn()
-    pygame.event.clear(SPAWN_OBSTACLE_EVENT)
-    red_enemy.jumpscare_played = False
-    blue_enemy.jumpscare_played = False
-    game_start_time = pygame.time.get_ticks()
+    game.restart()
+    renderer.invalidate()  # The jumpscare and game over screens covered the whole screen
 
 def draw_pause_menu():
     """Draw the pause menu for the Dinosaur Game."""
-    pause_text = font.render("Dinosaur Game Paused", True, BLACK)  # Render the pause text
-    resume_text = font.render("Press ESC to Resume", True, BLACK)  # Render the resume text
+    pause_text = text_cache.render(get_font(), "Dinosaur Game Paused", True, BLACK)  # Render the pause text
+    resume_text = text_cache.render(get_font(), "Press ESC to Resume", True, BLACK)  # Render the resume text
 
     # Draw the pause text in the center of the screen
-    screen.blit(pause_text, (pause_x, pause_y))
+    draw_list.add(pause_text, (pause_x, pause_y), dirty=True)
     # Draw the resume text below the pause text
-    screen.blit(resume_text, (resume_x,resume_y))
-
-    pygame.display.update()  # Update the display to show the pause menu
-
-def update_timer():
-    """Update the timer and display the current time."""
-    global current_time_label, minutesinmil, hours
-    elapsed_time = pygame.time.get_ticks() - game_start_time  # Calculate elapsed time since game start
-    total_minutes = elapsed_time // minutesinmil  # Convert elapsed time to minutes
-    if total_minutes >= 12:
-        return True  # End the game if 12 minutes have passed
-
-    hours = 12 + total_minutes // 2  # Calculate the current hour
-    minutes = (total_minutes % 2) * 30  # Calculate the current minutes (0 or 30)
-    if hours > 12:
-        hours -= 12  # Adjust hours to 12-hour format
-
-    current_time_label = f"{hours}:{minutes:02d} AM"  # Format the current time label
-    return False  # Continue the game
+    draw_list.add(resume_text, (resume_x,resume_y), dirty=True)
 
 def draw_timer():
     """Draw the timer on the screen."""
-    timer_text = font.render(current_time_label, True, BLACK)
-    screen.blit(timer_text, (SCREEN_WIDTH - timer_text.get_width() - 20, SCREEN_HEIGHT - timer_text.get_height() - 20))
+    timer_text = text_cache.render(get_font(), game.current_time_label, True, BLACK)  # Only rendered again when the label changes
+    draw_list.add(timer_text, (SCREEN_WIDTH - timer_text.get_width() - 20, SCREEN_HEIGHT - timer_text.get_height() - 20), dirty=True)
+
+def draw_frame():
+    """Draw the current game state for the camera the player is looking at."""
+    # Apply camera function based on POV (covers the entire screen)
+    view = game.current_pov
+    watching = []  # Enemies on the side camera being looked at
+    if view != "center":
+        watching = game.scheduler.on_camera(view)
+        view = (view, tuple(watching), game.flashlight)  # Side cameras change when an enemy or the flashlight does
+    full_redraw = renderer.begin_frame(view)  # Camera switches repaint the whole screen
+    if game.current_pov != "center":
+        # The enemies and the flashlight view baked over black into one opaque image
+        camera = asset_cache.load_composite(camera_layers(watching, game.flashlight), (SCREEN_WIDTH, SCREEN_HEIGHT))
+        if full_redraw:
+            draw_list.add(camera, (0, 0))
+        else:
+            draw_list.restore(camera)  # Only erase what was drawn last frame
+    else:
+        if full_redraw:
+            draw_list.add(asset_cache.load(*BACKGROUND_IMAGE), (0, 0))
+        else:
+            draw_list.restore(asset_cache.load(*BACKGROUND_IMAGE))  # Only erase what was drawn last frame
+
+        # Dinosaur game (inside the white box)
+        if game.dino_game_active:
+            #Draw sky and ground
+            draw_list.add(asset_cache.load(*SKY_IMAGE), (BOX_X, BOX_Y))  # Draw the sky image
+            draw_list.add(asset_cache.load(*GROUND_IMAGE), (ground_x,ground_y))  # Draw the ground image
+
+            # Draw Dino with animation
+            dino_frame = update_dino_animation()  # Get the current frame for the dinosaur animation
+            draw_list.add(dino_frame, dino, dirty=True)  # Draw the dinosaur frame
+
+            # Draw all obstacles
+            draw_list.extend(game.obstacles.blit_sequence(obstacle_image), dirty=True)
+
+            # Draw score
+            score_text = text_cache.render_number(get_font(), "Score: ", game.score, True, BLACK)  # Compose the score from cached digits
+            draw_list.add(score_text, (BOX_X + BOX_WIDTH - score_text.get_width() - 20, BOX_Y + BOX_HEIGHT - score_text.get_height() - 20), dirty=True)  # Draw the score text
+
+        if game.dino_paused:
+            draw_pause_menu()  # Draw the pause menu if the game is paused
+
+    # Draw timer
+    draw_timer()
+    draw_list.flush()  # Everything above in one Surface.blits call
+
+    if game.current_pov == "center":
+        # Draw the game box border (last, so obstacles fading out at the left edge slide under it)
+        pygame.draw.rect(screen, BLACK, (gameborder_x, gameborder_y, gamerborder_height, gameborder_width), 5)
+
+class PlayScene(Scene):
+    """The game itself: step the rules in fixed ticks to keep up with real time and draw the cameras."""
+
+    def __init__(self):
+        super().__init__()
+        self.lag = 0  # Real time not yet simulated, in milliseconds
+        self.pending = []  # Key events waiting for the next tick
+
+    def update(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == PROFILE_HUD_KEY:
+                profiler.toggle_hud()  # Show or hide the profiler overlay (only when profiling)
+                renderer.invalidate()  # Repaint whatever the overlay covered
+
+        # Key presses and releases are passed on to the game rules (kept for the next frame if no tick runs in this one)
+        self.pending += [(event.type, event.key) for event in events if event.type in (pygame.KEYDOWN, pygame.KEYUP)]
+
+        # Advance the game in fixed ticks to catch up with real time
+        self.lag = min(self.lag + clock.get_time(), TICK_MS * MAX_CATCH_UP_TICKS)  # Don't try to catch up after long stalls
+        while self.lag >= TICK_MS:
+            self.lag -= TICK_MS
+            if recorder and self.pending:
+                recorder.record(game.clock.tick_count, self.pending)
+            outcome = game.step(self.pending)
+            self.pending = []  # Key events only apply to the first tick of the frame
+            game.clock.advance()
+            if outcome == "win":
+                return WinScene(asset_cache.load(*WIN_IMAGE), WIN_SOUND)  # Game won by surviving until 6 AM or reaching 143 points
+            if outcome:
+                # The enemy stayed too long: play its jumpscare, then the game over screen
+                outcome.load_jumpscare()  # Usually already done by the prefetch thread
+                return JumpscareScene(outcome.jumpscare, outcome.jumpscare_sound_path, lambda: GameOverScene(retry))
+        return self
+
+    def draw(self):
+        loads = asset_cache.load_seconds
+        draw_frame()
+        hud = profiler.draw_hud(screen, get_font(16))
+        if hud:
+            renderer.mark(hud)  # Redrawn every frame so it is erased and pushed like the other moving parts
+        profiler.mark("draw")
+        profiler.split("draw", "loads", asset_cache.load_seconds - loads)  # Images loaded while drawing are shown on their own
+        renderer.present()  # Push the changed regions (or the whole screen) to the display
+        profiler.mark("present")
+
+def retry():
+    """Restart the game from the game over screen."""
+    game.retry()
+    renderer.invalidate()  # The jumpscare and game over screens covered the whole screen
+    if recorder:
+        recorder.retry(game.clock.tick_count)
+    return PlayScene()
+
+def init():
+    """Open the window and load what the first frame needs. Everything else is loaded after the first frame."""
+    global screen, running_frames, jump_frame
+    startup_timer.mark("imports")
+    screen = init_display()
+    startup_timer.mark("display")
+    open_asset_pack()
+    startup_timer.mark("asset pack")
+    running_frames, jump_frame = load_dino_sprite_sheet()  # Load the frames
+    startup_timer.mark("dino sprites")
+    if ASSET_WARM_UP:
+        asset_cache.warm_up(WARM_UP_ASSETS)  # Load the center camera images before the first frame
+        fade_ramps()  # Bake the obstacle fade ramps
+    if SPRITE_ATLAS:
+        # Pack the center camera's sprites into one page per way of blitting them so a frame draws from a few sources
+        draw_list.atlas = SpriteAtlas().build(running_frames + [jump_frame] + [asset_cache.load(*entry) for entry in ATLAS_SPRITES])
+        startup_timer.mark("sprite atlas")
+    get_font()
+    startup_timer.mark("first frame assets")
+
+def start_prefetch():
+    """Load the camera overlays, jumpscares and win screen on a background thread."""
+    jobs = [(entry[0], lambda entry=entry: asset_cache.load(*entry)) for entry in PREFETCH_ASSETS]
+    jobs += [(f"jumpscare {enemy.name}", enemy.load_jumpscare) for enemy in game.enemies]
+    # Side camera views with one enemy or none, with and without the flashlight (more enemies at once are baked when first seen)
+    views = [camera_layers(watching, flashlight) for watching in [[]] + [[enemy] for enemy in game.enemies] for flashlight in (False, True)]
+    jobs += [("camera " + " + ".join(layer[0] for layer in layers), lambda layers=layers: asset_cache.load_composite(layers, (SCREEN_WIDTH, SCREEN_HEIGHT))) for layers in views if layers]
+    jobs.append(("audio", audio.start))  # Open the mixer (the win sound is streamed when it plays)
+    if PREFETCH_ASSETS_IN_BACKGROUND:
+        prefetcher = Prefetcher(jobs, startup_timer)
+        prefetcher.start()
+        return prefetcher
+    for _, job in jobs:
+        job()  # No background thread: load everything now
+    startup_timer.mark("prefetch (no thread)")
+
+def start_recording():
+    """Start a new night and record its seed and key presses."""
+    global recorder
+    seed = game.new_night()
+    if RECORD_INPUT:
+        os.makedirs(RECORD_DIR, exist_ok=True)
+        recorder = Recorder(os.path.join(RECORD_DIR, time.strftime("night-%Y%m%d-%H%M%S.fnafrec")), seed)
+
+def handle_window_events(events):
+    """Rescale the game when the window is resized and switch fullscreen on FULLSCREEN_KEY."""
+    global fullscreen
+    for event in events:
+        if event.type == pygame.KEYDOWN and event.key == FULLSCREEN_KEY:
+            fullscreen = not fullscreen
+            renderer.resize(open_window(fullscreen))
+        elif event.type == pygame.VIDEORESIZE:
+            renderer.resize(pygame.display.get_surface())  # Same game screen, new scale
 
 def main():
-    global jumping, velocity_y, score, dino_game_active, dino_paused, current_pov, last_pov_change, flashlight, flashlightkeyduration
-    global gameover_x, gameover_y, retry_x, retry_y, pause_x, pause_y, resume_x, resume_y
-    running = True
-
-    while running:
-        if update_timer() or wingamecondition():
-            winsound.play()  # Play the win sound
-            scaled_win_image = pygame.transform.scale(win_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            screen.blit(scaled_win_image, (0, 0))
-            pygame.display.flip()
-            pygame.time.delay(5000)  # Display the win screen for 5 seconds
-            running = False  # Game won by surviving until 6 AM or reaching 143 points
-
-        # Apply camera function based on POV (covers the entire screen)
-        if current_pov == "left":
-            screen.fill(BLACK)
-            red_enemy.draw_indicator()
-        elif current_pov == "right":
-            screen.fill(BLACK)
-            blue_enemy.draw_indicator()
+    init()
+    start_recording()
+    prefetcher = None  # Started once the first frame is on screen
+
+    scene = PlayScene()
+    while scene is not None:
+        if SLEEP_WHEN_STATIC and scene.static and scene.drawn:
+            # Nothing changes on screen: sleep until an event arrives or the scene has to move on
+            events = [pygame.event.wait(scene.wake_in())]
+            profiler.mark("wait")  # Sleeping is not work
+            events += pygame.event.get()
         else:
-            screen.blit(background_image, (0, 0))
-
-            # Dinosaur game (inside the white box)
-            # Draw the game box border
-            pygame.draw.rect(screen, BLACK, (gameborder_x, gameborder_y, gamerborder_height, gameborder_width), 5)
-            
-            if dino_game_active:
-                if not dino_paused:
-                    # Update dinosaur position if jumping
-                    if jumping:
-                        dino.y += velocity_y  # Update vertical position
-                        velocity_y += gravity  # Apply gravity
-                        if dino.y >= dinosaur_y:
-                            dino.y = dinosaur_y  # Reset position if on the ground
-                            jumping = False  # Stop jumping
-
-                    # Update obstacles
-                    obstacle_speed = base_obstacle_speed + score // 1000  # Increase obstacle speed based on score
-                    for obstacle in list(obstacles):
-                        obstacle['rect'].x -= obstacle_speed  # Move obstacle to the left
-                        if obstacle['rect'].right < BOX_X + 30:  # Check if obstacle is near the left edge of the box
-                            obstacle['alpha'] -= 68  # Decrease obstacle transparency
-                            if obstacle['alpha'] <= 0:  # Remove obstacle if fully transparent
-                                obstacles.remove(obstacle)
-                                score += 1  # Increase score for successfully avoiding the obstacle
-                        else:
-                            if obstacle['alpha'] < 255:  # Increase obstacle transparency if not fully opaque
-                                obstacle['alpha'] += 10  # Increase obstacle transparency
-
-                        if dino.colliderect(obstacle['rect']):  # Check collision with obstacles
-                            score -= 10  # Decrease score by 10 for collision
-                            if score < 0:
-                                score = 0  # Ensure score doesn't go below 0
-                            obstacles.remove(obstacle)  # Remove the obstacle
-                            dino.x = dinosaur_x
-                            dino.y = dinosaur_y  # Reset dinosaur's vertical position
-                            break  # Exit the loop after handling collision
-
-                    # Ensure obstacles don't spawn too close to each other
-                    if obstacles and obstacles[-1]['rect'].x < OBSCTALE_SPAWN_X:
-                        pygame.time.set_timer(SPAWN_OBSTACLE_EVENT, random.randint(1500, 2500))
-
-                #Draw sky and ground
-                screen.blit(sky_image, (BOX_X, BOX_Y))  # Draw the sky image
-                screen.blit(ground_image, (ground_x,ground_y))  # Draw the ground image
-
-                # Draw Dino with animation
-                dino_frame = update_dino_animation()  # Get the current frame for the dinosaur animation
-                screen.blit(dino_frame, dino)  # Draw the dinosaur frame
-                
-                # Draw obstacles
-                for obstacle in obstacles:
-                    obstacle_image = pygame.image.load("images/obstacle.png").convert_alpha()  # Load the obstacle image
-                    obstacle_image = pygame.transform.scale(obstacle_image, (obstacle['rect'].width, obstacle['rect'].height))  # Scale the obstacle image
-                    obstacle_image.set_alpha(obstacle['alpha'])  # Set the transparency of the obstacle image
-                    screen.blit(obstacle_image, obstacle['rect'].topleft)  # Draw the obstacle image
-
-                # Draw score
-                score_text = font.render(f"Score: {score}", True, BLACK)  # Render the score text
-                screen.blit(score_text, (BOX_X + BOX_WIDTH - score_text.get_width() - 20, BOX_Y + BOX_HEIGHT - score_text.get_height() - 20))  # Draw the score text
-
-            if dino_paused:
-                draw_pause_menu()  # Draw the pause menu if the game is paused
-
-        # Spawn and handle enemies
-        red_enemy.spawn()  # Spawn the red enemy
-        blue_enemy.spawn()  # Spawn the blue enemy
-
-        red_enemy.update()  # Update the red enemy
-        blue_enemy.update()  # Update the blue enemy
-
-        # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if event.type == SPAWN_OBSTACLE_EVENT and dino_game_active and not dino_paused:
-                obstacle_height = random.randint(20, 60)
-
-                obstacle = {
-                    'rect': pygame.Rect(580, 350- obstacle_height, OBSTACLE_WIDTH, obstacle_height),
-                    'alpha': 0
-                }
-                obstacles.append(obstacle)
-                pygame.time.set_timer(SPAWN_OBSTACLE_EVENT, random.randint(1500, 2500))
-
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_r:
-                    Enemy.jumpscare_played = False
-                    if not dino_game_active:
-                        restart_dinosaur_game()
-                    elif dino_paused:
-                        dino_paused = False
-                if event.key == pygame.K_ESCAPE and current_pov == "center":
-                    dino_paused = not dino_paused
-                if event.key == pygame.K_f:
-                    key_held_start = pygame.time.get_ticks()  # Start tracking key press time
-                    flashlight = True
-
-            # Detect key release
-            if event.type == pygame.KEYUP:
-                if event.key == pygame.K_f:
-                    key_held_start = 0  # Reset when key is released
-                    flashlight = False
-
-        # Show flashlight image if flashlight is true
-        if flashlight:
-            if red_enemy.active and current_pov == "left":
-                indicator_image = pygame.image.load("images/BBflashlight.png").convert_alpha()
-                indicator_image = pygame.transform.scale(indicator_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                screen.blit(indicator_image, (0, 0))
-            elif blue_enemy.active and current_pov == "right":
-                indicator_image = pygame.image.load("images/toy_bonnieflashlight.png").convert_alpha()
-                indicator_image = pygame.transform.scale(indicator_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                screen.blit(indicator_image, (0, 0))
-            elif current_pov == "left" or current_pov == "right":
-                indicator_image = pygame.image.load("images/noneflashlight.png").convert_alpha()
-                indicator_image = pygame.transform.scale(indicator_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                screen.blit(indicator_image, (0, 0))
-            elif current_pov == "center":
-                flashlight = False  # Disable flashlight in center POV
-
-        # User input
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE] and not jumping and dino_game_active and not dino_paused:
-            jumping = True
-            velocity_y = jump_velocity
-        if keys[pygame.K_a] and pygame.time.get_ticks() - last_pov_change > 500:
-            current_pov = "left" if current_pov == "center" else "center"
-            last_pov_change = pygame.time.get_ticks()
-        if keys[pygame.K_d] and pygame.time.get_ticks() - last_pov_change > 500:
-            current_pov = "right" if current_pov == "center" else "center"
-            last_pov_change = pygame.time.get_ticks()
-        if keys [pygame.K_f]:
-            if key_held_start and pygame.time.get_ticks() - key_held_start > flashlightkeyduration:
-                if red_enemy.active and current_pov == "left":
-                    red_enemy.despawn()
-                elif blue_enemy.active and current_pov == "right":
-                    blue_enemy.despawn()
-                key_held_start = pygame.time.get_ticks()  # Reset the timer to allow continuous despawning
-
-        # Draw timer
-        draw_timer()
-
-        pygame.display.flip()
+            events = pygame.event.get()
+        profiler.mark("events")
+        if any(event.type == pygame.QUIT for event in events):
+            break
+        handle_window_events(events)
+
+        scene = scene.update(events)
+        profiler.mark("update")
+        if scene is not None:
+            scene.draw()
+            profiler.mark("draw")
+        if prefetcher is None:
+            startup_timer.mark("first frame")
+            prefetcher = start_prefetch()
         clock.tick(FPS)
-
+        profiler.mark("wait")
+        profiler.end_frame()
+
+    profiler.close()  # Write the rest of the profile log
+    if recorder:
+        recorder.close(game.clock.tick_count, game.score)
+        print(f"Night recorded to {recorder.path} (replay it with 'python replay.py {recorder.path}')")
+    if PROFILE:
+        print(f"Frame profile (p50, p95, p99 ms): {profiler.stats()}")
+    if STARTUP_REPORT:
+        print(startup_timer.report())  # Time taken by each startup phase, including the background loads
+    if DEBUG_STATS:
+        print(f"Asset cache: {asset_cache.stats()}")  # Report cache hits, misses and memory use
+        if asset_cache.pack:
+            print(f"Asset pack: {asset_cache.pack.stats()}")  # Report images mapped from the pack and stale ones
+        print(f"Renderer: {renderer.stats()}")  # Report pixels pushed per frame
+        print(f"Draw list: {draw_list.stats()}")  # Report blits and blit calls per frame
+        if draw_list.atlas:
+            print(f"Sprite atlas: {draw_list.atlas.stats()}")  # Report sprites packed and the memory they use
+        print(f"Text cache: {text_cache.stats()}")  # Report how often labels had to be rendered
+        print(f"Audio: {audio.stats()}")  # Report sounds decoded, played and cut off, and their estimated latency
     pygame.quit()
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+import json  # Import the json library
+import mmap  # Import the memory-mapping library
+import os  # Import the os library
+import struct  # Import the struct library
+import pygame  # Import the pygame library
+
+MAGIC = b"FNAFPACK"  # First bytes of every asset pack
+VERSION = 1  # Bumped whenever the layout changes, older packs are ignored
+HEADER = struct.Struct("<8sII")  # Magic, version and length of the JSON index
+ALIGN = 64  # Pixel data of each image starts on a multiple of this
+
+class AssetPack:
+    """Images baked at their final size and pixel format into one file, memory-mapped and wrapped in surfaces without decoding."""
+
+    def __init__(self, path):
+        self.path = path  # Pack file
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)  # Copy-on-write so drawing on a surface never touches the file
+        magic, version, index_length = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} asset pack")
+        index = json.loads(self.map[HEADER.size:HEADER.size + index_length])
+        self.sources = {source: tuple(stamp) for source, stamp in index["sources"].items()}  # (mtime_ns, size) of each source file when baked
+        self.entries = {}  # (offset, source) by cache key
+        for entry in index["entries"]:
+            self.entries[entry_key(entry)] = (entry["offset"], entry["source"])
+        self.fresh = {}  # Whether each source file is unchanged since the pack was built, checked once
+        self.loaded = 0  # Number of surfaces served from the pack
+        self.stale = 0  # Number of lookups that fell back to the image files because the source changed
+
+    @classmethod
+    def open(cls, path):
+        """Return the pack at path, or None if there is no usable pack."""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error opening asset pack {path}: {e}")
+            return None
+
+    def is_fresh(self, source):
+        """Return True if the source file still has the modification time and size it had when the pack was built."""
+        fresh = self.fresh.get(source)
+        if fresh is None:
+            try:
+                stat = os.stat(source)
+                fresh = (stat.st_mtime_ns, stat.st_size) == self.sources[source]
+            except OSError:
+                fresh = False  # Source deleted: the baked copy may be out of date
+            self.fresh[source] = fresh
+        return fresh
+
+    def has(self, key):
+        """Return True if the pack holds an up to date surface for key."""
+        entry = self.entries.get(key)
+        return entry is not None and self.is_fresh(entry[1])
+
+    def surface(self, key):
+        """Return the surface for a cache key, or None if it isn't in the pack or its source file changed."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        offset, source = entry
+        if not self.is_fresh(source):
+            self.stale += 1
+            return None
+        size, alpha = key[1], key[2]
+        pixels = memoryview(self.map)[offset:offset + size[0] * size[1] * 4]
+        surface = pygame.image.frombuffer(pixels, size, "BGRA")  # Shares the mapped pages, nothing is decoded or copied
+        if not alpha:
+            surface = surface.convert()  # Opaque images drop the alpha channel so they blit as plain copies
+        elif surface.get_masks()[:3] != pygame.display.get_surface().get_masks()[:3]:
+            surface = surface.convert_alpha()  # Only needed when the display doesn't use the baked channel order
+        self.loaded += 1
+        return surface
+
+    def close(self):
+        """Unmap the pack. Surfaces returned by surface() must not be used afterwards."""
+        self.map.close()
+
+    def stats(self):
+        """Return the pack counters as a dictionary."""
+        return {
+            "entries": len(self.entries),
+            "loaded": self.loaded,
+            "stale": self.stale,
+            "stale_sources": sorted(source for source, fresh in self.fresh.items() if not fresh),
+        }
+
+def entry_key(entry):
+    """Return the asset cache key of an index entry: (path, size, alpha), plus the frame index for sprite sheet frames."""
+    key = (entry["source"], tuple(entry["size"]), entry["alpha"])
+    return key if entry["frame"] is None else key + (entry["frame"],)
+
+def write_pack(path, images):
+    """Write a list of (key, surface) pairs to a pack file at path, replacing it only once it is complete."""
+    entries, blobs, sources = [], [], {}
+    for source in {key[0] for key, _ in images}:
+        stat = os.stat(source)
+        sources[source] = (stat.st_mtime_ns, stat.st_size)  # Used to notice images changed after the build
+    for key, surface in images:
+        entries.append({"source": key[0], "size": list(key[1]), "alpha": key[2], "frame": key[3] if len(key) > 3 else None, "offset": 0})
+        blobs.append(pygame.image.tobytes(surface, "BGRA"))  # Byte order of the usual 32-bit display format
+
+    # The offsets are part of the index, so grow the reserved index space until it fits
+    reserved = ALIGN
+    while True:
+        offset = align(HEADER.size + reserved)
+        for entry, blob in zip(entries, blobs):
+            entry["offset"] = offset
+            offset = align(offset + len(blob))
+        index = json.dumps({"sources": sources, "entries": entries}).encode()
+        if len(index) <= reserved:
+            break
+        reserved = align(len(index))
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(index)))
+        file.write(index)
+        for entry, blob in zip(entries, blobs):
+            file.seek(entry["offset"])
+            file.write(blob)
+    os.replace(temporary, path)  # The game never maps a half-written pack
+    return offset
+
+def align(offset):
+    """Round offset up to the next multiple of ALIGN."""
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
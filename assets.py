@@ -0,0 +1,220 @@
+import pygame  # Import the pygame library
+import threading  # Import the threading library
+import time  # Import the time library
+from collections import OrderedDict  # Ordered dictionary used to track the least recently used assets
+
+COLORKEY = (255, 0, 255)  # Colour of the transparent pixels of colorkey images (magenta, checked to be unused by the image)
+
+class AssetCache:
+    """Load, convert and scale images once and keep them in a memory-bounded LRU cache."""
+
+    def __init__(self, max_bytes, cheapest_blits=True):
+        self.max_bytes = max_bytes  # Memory budget for all cached surfaces
+        self.cheapest_blits = cheapest_blits  # Convert each image to the cheapest way of blitting it (opaque, colorkey or per-pixel alpha)
+        self.aliases = {}  # Composite key -> image key, for composites that are just one of their layers
+        self.surfaces = OrderedDict()  # Cached surfaces, least recently used first
+        self.bytes_used = 0  # Memory currently used by cached surfaces
+        self.hits = 0  # Number of lookups served from the cache
+        self.misses = 0  # Number of lookups that had to load from disk
+        self.evictions = 0  # Number of surfaces dropped to stay within the budget
+        self.lock = threading.Lock()  # The prefetch thread loads into the cache while the game reads from it
+        self.pack = None  # Asset pack tried before decoding the image files, set by settings.open_asset_pack()
+        self.load_seconds = 0.0  # Time the game loop spent loading images on cache misses (not the prefetch thread)
+
+    def load(self, path, size=None, alpha=True):
+        """Return the image at path scaled to size, loading it from disk only on a cache miss."""
+        key = (path, tuple(size) if size else None, alpha)  # Cache key: path, target size and alpha mode
+        surface = self.lookup(key)
+        if surface is not None:
+            return surface
+
+        start = time.perf_counter()
+        surface = self.pack.surface(key) if self.pack else None  # Already scaled and converted in the pack
+        if surface is None:
+            surface = self.decode(*key)  # Decode outside the lock so the game keeps running
+        if self.cheapest_blits:
+            surface = cheapest_blit(surface)
+        self.store(key, surface)
+        self.count_load(start)
+        return surface
+
+    def decode(self, path, size=None, alpha=True):
+        """Decode the image file at path, convert it to the display format and scale it to size."""
+        surface = pygame.image.load(path)  # Decode the image from disk
+        surface = surface.convert_alpha() if alpha else surface.convert()  # Match the display pixel format
+        if size and surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)  # Scale once to the requested size
+        return surface
+
+    def load_frames(self, path, grid, indices, size, alpha=True):
+        """Return the frames at indices of a sprite sheet split into a (cols, rows) grid, each scaled to size."""
+        keys = [(path, tuple(size), alpha, index) for index in indices]
+        frames = [self.lookup(key) for key in keys]
+        cached = [frame is not None for frame in frames]
+        if self.pack:
+            frames = [frame or self.pack.surface(key) for frame, key in zip(frames, keys)]
+        missing = [index for index, frame in zip(indices, frames) if frame is None]
+        if missing:
+            decoded = dict(zip(missing, self.decode_frames(path, grid, missing, size, alpha)))  # Decode the sheet once for all of them
+            frames = [frame or decoded[index] for frame, index in zip(frames, indices)]
+        if self.cheapest_blits:
+            frames = [frame if hit else cheapest_blit(frame) for frame, hit in zip(frames, cached)]
+        for key, frame in zip(keys, frames):
+            self.store(key, frame)
+        return frames
+
+    def decode_frames(self, path, grid, indices, size, alpha=True):
+        """Decode a sprite sheet and cut out the frames at indices, each scaled to size."""
+        sheet = pygame.image.load(path)  # Decode the sprite sheet
+        sheet = sheet.convert_alpha() if alpha else sheet.convert()  # Match the display pixel format
+        return [pygame.transform.scale(sheet.subsurface(frame_area(sheet.get_size(), *grid, index)), size) for index in indices]
+
+    def load_faded(self, path, size, alpha, step=10):
+        """Return the image at the level of its fade ramp closest to alpha, building the whole ramp the first time."""
+        level = min(round(max(alpha, 0) / step) * step, 255)  # Levels every step from 0, plus fully opaque
+        surface = self.lookup((path, tuple(size), "faded", level))
+        if surface is None:
+            surface = self.load_fade_ramp(path, size, step)[level // step if level < 255 else -1]
+        return surface
+
+    def load_fade_ramp(self, path, size, step=10):
+        """Return the image faded to every level from 0 to 255 in steps of step (and 255), baked once and cached."""
+        levels = list(range(0, 255, step)) + [255]
+        keys = [(path, tuple(size), "faded", level) for level in levels]
+        ramp = [self.lookup(key) for key in keys]
+        if all(surface is not None for surface in ramp):
+            return ramp
+
+        image = self.load(path, size)
+        start = time.perf_counter()
+        for index, (key, level) in enumerate(zip(keys, levels)):
+            if ramp[index] is None:
+                ramp[index] = faded_copy(image, level)
+                self.store(key, ramp[index])
+        self.count_load(start)
+        return ramp
+
+    def load_composite(self, layers, size):
+        """Return the (path, size, alpha) layers drawn in order over black as one opaque image, built once and cached."""
+        key = ("composite", tuple(layers), tuple(size))
+        if key in self.aliases:
+            return self.load(*self.aliases[key])
+        surface = self.lookup(key)
+        if surface is not None:
+            return surface
+
+        images = [self.load(*layer) for layer in layers]
+        start = time.perf_counter()
+        for index in range(len(images) - 1, -1, -1):
+            if blit_path(images[index]) == "opaque" and images[index].get_size() == tuple(size):
+                if index == len(images) - 1:
+                    self.aliases[key] = layers[index]  # The top layer hides the others: use it as it is, no copy
+                    return images[index]
+                images = images[index:]  # Layers under an opaque one are hidden
+                break
+        surface = pygame.Surface(size).convert()
+        surface.fill((0, 0, 0))
+        for image in images:
+            surface.blit(image, (0, 0))
+        self.store(key, surface)
+        self.count_load(start)
+        return surface
+
+    def count_load(self, start):
+        """Add the time since start to load_seconds if the load happened on the game loop's thread."""
+        if threading.current_thread() is threading.main_thread():
+            self.load_seconds += time.perf_counter() - start
+
+    def lookup(self, key):
+        """Return the cached surface for key and count the hit or miss."""
+        with self.lock:
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.surfaces.move_to_end(key)  # Mark as most recently used
+                self.hits += 1
+            else:
+                self.misses += 1
+            return surface
+
+    def store(self, key, surface):
+        """Add a surface to the cache and evict the least recently used ones if over budget."""
+        with self.lock:
+            if key in self.surfaces:
+                return  # Loaded by another thread in the meantime
+            self.surfaces[key] = surface
+            self.bytes_used += surface_bytes(surface)
+            while self.bytes_used > self.max_bytes and len(self.surfaces) > 1:
+                _, evicted = self.surfaces.popitem(last=False)  # Drop the least recently used surface
+                self.bytes_used -= surface_bytes(evicted)
+                self.evictions += 1
+
+    def warm_up(self, entries):
+        """Load a list of (path, size, alpha) entries ahead of time so the first frames don't hit the disk."""
+        for path, size, alpha in entries:
+            self.load(path, size, alpha)
+
+    def clear(self):
+        """Drop every cached surface."""
+        with self.lock:
+            self.surfaces.clear()
+            self.aliases.clear()
+            self.bytes_used = 0
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.surfaces),
+            "bytes": self.bytes_used,
+        }
+
+def frame_area(sheet_size, cols, rows, index):
+    """Return the area of frame index in a sheet split into cols x rows frames (left to right, top to bottom)."""
+    width, height = sheet_size[0] // cols, sheet_size[1] // rows  # Size of each frame
+    row, col = divmod(index, cols)
+    return pygame.Rect(col * width, row * height, width, height)
+
+def surface_bytes(surface):
+    """Return the number of bytes used by a surface's pixels."""
+    return surface.get_pitch() * surface.get_height()
+
+def blit_path(surface):
+    """Return how Surface.blit draws surface: 'opaque', 'colorkey', 'alpha' (per-pixel) or 'surface alpha' (faded as a whole)."""
+    alpha = surface.get_alpha()
+    if alpha is not None and alpha < 255:
+        return "surface alpha"
+    if surface.get_flags() & pygame.SRCALPHA:
+        return "alpha"
+    return "colorkey" if surface.get_colorkey() else "opaque"
+
+def cheapest_blit(surface):
+    """Return surface converted to the cheapest blit that draws the same pixels, or surface itself if it needs per-pixel alpha."""
+    if blit_path(surface) != "alpha":
+        return surface  # Already opaque, colorkeyed or faded
+    width, height = surface.get_size()
+    opaque = pygame.mask.from_surface(surface, 254).count()  # Pixels with alpha 255
+    if opaque == width * height:
+        return surface.convert()  # No transparency at all: plain copies
+    if pygame.mask.from_surface(surface, 0).count() != opaque:
+        return surface  # Some pixels are partly transparent
+    keyed = pygame.Surface((width, height)).convert()
+    keyed.fill(COLORKEY)
+    keyed.blit(surface, (0, 0))  # Fully transparent pixels keep the colorkey
+    keyed.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    if pygame.mask.from_surface(keyed).count() != opaque:
+        return surface  # The image uses the colorkey colour itself
+    return keyed
+
+def faded_copy(image, alpha):
+    """Return a copy of image drawn at alpha, in the cheapest form: surface alpha for opaque images, baked into the pixels otherwise."""
+    if blit_path(image) == "opaque":
+        faded = image.copy()  # Don't change the shared image
+        faded.set_alpha(alpha)
+        return faded
+    faded = image.convert_alpha()  # Copy with per-pixel alpha (colorkey pixels become transparent)
+    faded.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)  # Scale every pixel's alpha, no surface alpha to apply when drawn
+    return faded
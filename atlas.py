@@ -0,0 +1,77 @@
+import pygame  # Import the pygame library
+from assets import COLORKEY, blit_path  # Import how each sprite is blitted
+
+class SpriteAtlas:
+    """Small sprites packed into one or a few large surfaces at load time, drawn with an area rect instead of a surface each."""
+
+    def __init__(self, page_width=1024, max_page_height=1024):
+        self.page_width = page_width  # Width of every page
+        self.max_page_height = max_page_height  # A new page is started when a page would grow taller than this
+        self.pages = []  # Surfaces the sprites were packed into
+        self.regions = {}  # Packed surface -> (page, area of the page holding its pixels)
+
+    def build(self, sprites):
+        """Pack a list of surfaces into pages on shelves, tallest first, with separate pages for opaque, colorkey and per-pixel alpha sprites. Needs the display to be open."""
+        groups = {}  # Blit path -> sprites drawn that way
+        for sprite in set(sprites):
+            width, height = sprite.get_size()
+            if width > self.page_width or height > self.max_page_height:
+                continue  # Too big to pack, drawn from its own surface
+            kind = blit_path(sprite)
+            if kind == "surface alpha" or (kind == "alpha" and sprite.get_flags() & pygame.RLEACCELOK):
+                continue  # Faded as a whole or run-length encoded: only their own surface draws the same pixels
+            if kind == "opaque" and not pygame.mask.from_threshold(sprite, COLORKEY, (1, 1, 1, 255)).count():
+                kind = "colorkey"  # Doesn't use the colorkey colour, so the colorkey page draws it the same (one page less per frame)
+            groups.setdefault(kind, []).append(sprite)
+        for kind in sorted(groups):
+            self.pack(kind, groups[kind])
+        return self
+
+    def pack(self, kind, sprites):
+        """Pack sprites that are all blitted the same way into new pages blitted that way too."""
+        placements = []  # (sprite, page index, x, y)
+        page, x, y, shelf_height = 0, 0, 0, 0
+        heights = [0]  # Used height of each page
+        for sprite in sorted(sprites, key=lambda sprite: (-sprite.get_height(), -sprite.get_width())):
+            width, height = sprite.get_size()
+            if x + width > self.page_width:
+                x, y, shelf_height = 0, y + shelf_height, 0  # Start a new shelf below the current one
+            if y + height > self.max_page_height:
+                page, x, y, shelf_height = page + 1, 0, 0, 0  # Start a new page
+                heights.append(0)
+            placements.append((sprite, page, x, y))
+            x += width
+            shelf_height = max(shelf_height, height)
+            heights[page] = max(heights[page], y + height)
+
+        pages = [new_page(kind, (self.page_width, height)) for height in heights]
+        for sprite, page, x, y in placements:
+            # A plain blit copies alpha pixels onto a fully transparent page exactly and leaves colorkey pixels keyed
+            area = pages[page].blit(sprite, (x, y))
+            self.regions[sprite] = (pages[page], area)
+        if kind == "colorkey":
+            for surface in pages:
+                surface.set_colorkey(COLORKEY, pygame.RLEACCEL)  # Keyed and run-length encoded like the sprites
+        self.pages += pages
+
+    def lookup(self, surface):
+        """Return (page, area) holding the pixels of surface, or (surface, None) if it wasn't packed."""
+        return self.regions.get(surface, (surface, None))
+
+    def stats(self):
+        """Return the atlas counters as a dictionary."""
+        return {
+            "sprites": len(self.regions),
+            "pages": len(self.pages),
+            "bytes": sum(page.get_pitch() * page.get_height() for page in self.pages),
+        }
+
+def new_page(kind, size):
+    """Return an empty page for sprites blitted as kind: transparent for alpha, filled with the colorkey for colorkey."""
+    if kind == "alpha":
+        page = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        page.fill((0, 0, 0, 0))
+    else:
+        page = pygame.Surface(size).convert()
+        page.fill(COLORKEY if kind == "colorkey" else (0, 0, 0))
+    return page
@@ -0,0 +1,126 @@
+import threading  # Import the threading library
+import time  # Import the time library
+import pygame  # Import the pygame library
+
+class AudioEngine:
+    """Sounds played on channels reserved for each category, long clips streamed from disk and short ones decoded on first use."""
+
+    def __init__(self, categories, streamed=(), frequency=44100, buffer=512):
+        self.categories = dict(categories)  # Category -> number of channels reserved for it
+        self.streamed = set(streamed)  # Clips played through pygame.mixer.music instead of being decoded into memory
+        self.frequency = frequency  # Mixer sample rate
+        self.buffer = buffer  # Mixer buffer in samples: smaller starts sounds sooner but needs a faster audio thread
+        self.started = False  # Whether the mixer was opened (False again if there is no audio device)
+        self.failed = False  # The mixer could not be opened, play() does nothing
+        self.pools = {}  # Category -> its reserved channels, set by start()
+        self.started_at = {}  # Channel -> time its sound started, to find the one playing longest
+        self.sounds = {}  # Decoded clips by path (None if the clip could not be loaded)
+        self.lock = threading.Lock()  # The prefetch thread and the game may both decode a clip
+        self.decodes = 0  # Clips decoded into memory
+        self.decode_seconds = 0.0  # Time spent decoding clips
+        self.decoded_bytes = 0  # Memory used by the decoded clips
+        self.plays = {}  # Category -> sounds played
+        self.streams = 0  # Clips played through the music stream
+        self.steals = 0  # Sounds cut off because every channel of their category was busy
+        self.latencies = {}  # Category -> estimated milliseconds from each trigger to its first samples being mixed (see played())
+
+    def start(self):
+        """Open the mixer and reserve the channels of each category. Returns False if there is no audio device."""
+        with self.lock:
+            if self.started or self.failed:
+                return self.started
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init(self.frequency, -16, 2, self.buffer)
+            except pygame.error as e:
+                print(f"Error starting audio: {e}")
+                self.failed = True
+                return False
+            total = sum(self.categories.values())
+            pygame.mixer.set_num_channels(total)
+            pygame.mixer.set_reserved(total)  # Sound.play() and find_channel() never take a reserved channel
+            first = 0
+            for category, count in self.categories.items():
+                self.pools[category] = [pygame.mixer.Channel(index) for index in range(first, first + count)]
+                first += count
+            self.started = True
+            return True
+
+    def load(self, path):
+        """Return the decoded clip at path, decoding it the first time. Streamed clips and missing files return None."""
+        if path in self.streamed or not self.start():
+            return None
+        with self.lock:
+            if path not in self.sounds:
+                start = time.perf_counter()
+                try:
+                    sound = pygame.mixer.Sound(path)
+                except (pygame.error, FileNotFoundError) as e:
+                    print(f"Error loading sound {path}: {e}")
+                    sound = None
+                self.sounds[path] = sound
+                if sound:
+                    frequency, size, channels = pygame.mixer.get_init()
+                    self.decoded_bytes += int(sound.get_length() * frequency) * abs(size) // 8 * channels
+                    self.decodes += 1
+                    self.decode_seconds += time.perf_counter() - start
+            return self.sounds[path]
+
+    def play(self, path, category):
+        """Play the clip at path on a channel of category and return the channel (None when streamed or silent)."""
+        trigger = time.perf_counter()
+        if not path or not self.start():
+            return None
+        if path in self.streamed:
+            try:
+                pygame.mixer.music.load(path)  # Only the first buffer is read now, the rest as it plays
+                pygame.mixer.music.play()
+            except pygame.error as e:
+                print(f"Error streaming sound {path}: {e}")
+                return None
+            self.streams += 1
+            self.played(category, trigger)
+            return None
+        sound = self.load(path)  # Decoded now if the prefetch thread did not get to it
+        if sound is None:
+            return None
+        pool = self.pools[category]
+        channel = next((channel for channel in pool if not channel.get_busy()), None)
+        if channel is None:
+            channel = min(pool, key=self.started_at.get)  # Cut off the sound of this category that has played longest
+            self.steals += 1
+        channel.play(sound)
+        self.started_at[channel] = trigger
+        self.played(category, trigger)
+        return channel
+
+    def played(self, category, trigger):
+        """Record a play of category triggered at trigger (from time.perf_counter())."""
+        self.plays[category] = self.plays.get(category, 0) + 1
+        # An estimate, not a measurement: pygame can't tell when a channel's first samples are mixed. The time
+        # play() took (decoding, loading the stream) plus one buffer, the longest the mixer takes to pick the sound up
+        latency = (time.perf_counter() - trigger) * 1000 + self.buffer_ms()
+        self.latencies.setdefault(category, []).append(latency)
+
+    def buffer_ms(self):
+        """Return the length of one mixer buffer in milliseconds."""
+        return self.buffer / self.frequency * 1000
+
+    def stop(self):
+        """Stop every sound and the music stream."""
+        if self.started:
+            pygame.mixer.stop()
+            pygame.mixer.music.stop()
+
+    def stats(self):
+        """Return the audio counters as a dictionary."""
+        return {
+            "channels": {category: len(pool) for category, pool in self.pools.items()},
+            "decodes": self.decodes,
+            "decode_ms": self.decode_seconds * 1000,
+            "decoded_bytes": self.decoded_bytes,
+            "plays": dict(self.plays),
+            "streams": self.streams,
+            "steals": self.steals,
+            "estimated_latency_ms_max": {category: max(values) for category, values in self.latencies.items()},
+        }
@@ -0,0 +1,75 @@
+import argparse  # Import the argparse library
+import hashlib  # Import the hashlib library
+import os  # Import the os library
+import sys  # Import the sys library
+import time  # Import the time library
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Run the real game code without a window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # or a sound card
+import pygame  # Import the pygame library
+import FNAFFANGAME as fnaf  # Import the game itself (nothing starts until init())
+from simulation import Autopilot  # Import the bot that plays the dinosaur game
+
+MODES = {  # Name: (use the sprite atlas, one Surface.blits call per frame)
+    "separate": (False, False),  # One Surface.blit per sprite, each from its own surface (the loop before the draw list)
+    "batched": (False, True),
+    "atlas": (True, True),
+}
+
+def run_mode(name, frames, atlas):
+    """Play the center camera with the bot and return the draw time, call counts and a hash of the frames drawn."""
+    use_atlas, batch = MODES[name]
+    draw_list = fnaf.draw_list
+    draw_list.atlas, draw_list.batch = (atlas if use_atlas else None), batch
+    draw_list.frames = draw_list.blits = draw_list.calls = 0
+    sources = []  # Distinct source surfaces of each frame
+    flush = draw_list.flush
+    def counting_flush():
+        sources.append(len({id(item[0]) for item in draw_list.items}))
+        flush()
+    draw_list.flush = counting_flush
+
+    fnaf.game.new_night(0)
+    fnaf.current_frame_index, fnaf.animation_timer = 0, 0  # Same dinosaur animation in every mode
+    fnaf.renderer.invalidate()
+    bot = Autopilot()
+    digest = hashlib.sha1()
+    seconds = 0.0
+    for frame in range(frames):
+        outcome = fnaf.game.step(bot(fnaf.game))
+        fnaf.game.clock.advance()
+        if outcome:
+            fnaf.game.retry()
+            fnaf.renderer.invalidate()
+        fnaf.game.current_pov = "center"  # Time the camera with the sprites, the bot's camera trips are not drawn
+        start = time.perf_counter()
+        fnaf.draw_frame()
+        seconds += time.perf_counter() - start
+        fnaf.renderer.present()
+        if frame % 10 == 0:
+            digest.update(pygame.image.tobytes(fnaf.screen, "RGB"))  # Every 10th frame, hashing them all takes longer than drawing
+    del draw_list.flush
+    stats = draw_list.stats()
+    return {"ms": seconds / frames * 1000, "blits": stats["blits_per_frame"], "calls": stats["calls_per_frame"],
+            "sources": sum(sources) / len(sources), "digest": digest.hexdigest()}
+
+def main(argv=None):
+    """Draw the center camera with and without the sprite atlas and batching and print what each saves."""
+    parser = argparse.ArgumentParser(description="Compare drawing the center camera sprite by sprite with the atlas and one Surface.blits call.")
+    parser.add_argument("--frames", type=int, default=3000, help="frames drawn per mode")
+    args = parser.parse_args(argv)
+
+    fnaf.init()
+    atlas = fnaf.draw_list.atlas or fnaf.SpriteAtlas().build(fnaf.running_frames + [fnaf.jump_frame] + [fnaf.asset_cache.load(*entry) for entry in fnaf.ATLAS_SPRITES])
+    results = {name: run_mode(name, args.frames, atlas) for name in MODES}
+    base = results["separate"]
+    print(f"{'mode':<10}{'ms/frame':>10}{'blits':>8}{'calls':>8}{'calls saved':>13}{'sources':>9}")
+    for name, result in results.items():
+        print(f"{name:<10}{result['ms']:>10.3f}{result['blits']:>8.1f}{result['calls']:>8.1f}{base['calls'] - result['calls']:>13.1f}{result['sources']:>9.1f}")
+    if len({result["digest"] for result in results.values()}) != 1:
+        print("The modes drew different pixels")
+        return 1
+    print("Every mode drew the same pixels")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
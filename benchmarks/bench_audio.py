@@ -0,0 +1,68 @@
+import os  # Import the os library
+import sys  # Import the sys library
+import time  # Import the time library
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # Mix the sounds without a sound card
+import pygame  # Import the pygame library
+from audio import AudioEngine  # Import the audio engine
+from settings import AUDIO_BUFFER, AUDIO_CHANNELS, AUDIO_FREQUENCY, ENEMY_ROSTER, STREAMED_SOUNDS, WIN_SOUND  # Import the game's audio settings
+
+JUMPSCARE_SOUNDS = [entry["sound"] for entry in ENEMY_ROSTER if entry.get("sound")]
+
+def new_engine(streamed=STREAMED_SOUNDS):
+    """Return a started audio engine with the game's settings and nothing playing."""
+    if pygame.mixer.get_init():
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
+    engine = AudioEngine(AUDIO_CHANNELS, streamed, AUDIO_FREQUENCY, AUDIO_BUFFER)
+    engine.start()
+    return engine
+
+def stream_start_ms():
+    """Return the milliseconds until the music stream reports its first samples played."""
+    start = time.perf_counter()
+    while pygame.mixer.music.get_pos() <= 0 and time.perf_counter() - start < 1:
+        time.sleep(0.0005)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    """Time the first sounds played with and without decoding them ahead, and check that each category keeps to its channels."""
+    # Estimated trigger to mixing (time play() took plus one mixer buffer): decoded on the trigger, or decoded ahead like the prefetch thread does
+    print("Estimated latency: time play() took plus one mixer buffer")
+    print(f"{'clip':<36}{'decoded on trigger ms':>23}{'decoded ahead ms':>18}{'memory KB':>11}")
+    for path in JUMPSCARE_SOUNDS:
+        engine = new_engine()
+        engine.play(path, "jumpscare")
+        cold = engine.latencies["jumpscare"][-1]
+        engine = new_engine()
+        engine.load(path)
+        engine.play(path, "jumpscare")
+        warm = engine.latencies["jumpscare"][-1]
+        print(f"{path:<36}{cold:>23.2f}{warm:>18.2f}{engine.decoded_bytes / 1024:>11.0f}")
+
+    # The win sound streamed from disk or decoded into memory
+    engine = new_engine([])
+    engine.play(WIN_SOUND, "ui")
+    print(f"{WIN_SOUND + ' decoded':<36}{engine.latencies['ui'][-1]:>23.2f}{'':>18}{engine.decoded_bytes / 1024:>11.0f}")
+    engine = new_engine()
+    engine.play(WIN_SOUND, "ui")
+    measured = stream_start_ms()
+    print(f"{WIN_SOUND + ' streamed':<36}{engine.latencies['ui'][-1]:>23.2f}{'':>18}{engine.decoded_bytes / 1024:>11.0f}"
+          f"  (measured: the stream reported its first samples {measured:.1f} ms after play() returned)")
+
+    # Overlapping jumpscares while a ui sound plays: each category stays on its own channels
+    engine = new_engine([])
+    for path in JUMPSCARE_SOUNDS:
+        engine.load(path)
+    ui = engine.play(WIN_SOUND, "ui")
+    used = [engine.play(path, "jumpscare") for path in JUMPSCARE_SOUNDS * 2]  # More jumpscares than jumpscare channels
+    pool = engine.pools["jumpscare"]
+    leaked = [channel for channel in used if channel not in pool]
+    print(f"{len(used)} jumpscares on {len(pool)} channels: {engine.steals} cut off, ui sound still playing: {ui.get_busy()}")
+    print(f"Audio: {engine.stats()}")
+    if leaked or not ui.get_busy():
+        print("A jumpscare took a channel outside its category")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import argparse  # Import the argparse library
+import os  # Import the os library
+import sys  # Import the sys library
+import time  # Import the time library
+import timeit  # Import the timeit library
+import tracemalloc  # Import the tracemalloc library
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Run the game rules without a window
+from simulation import Autopilot, GameState, NightBatch, Simulation, run_night  # Import the headless game
+
+def memory_per_night(count):
+    """Return the bytes one night of a batch of count nights takes."""
+    tracemalloc.start()
+    batch = NightBatch(range(count), [Autopilot() for _ in range(count)])
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / count
+
+def main(argv=None):
+    """Compare playing nights one after another with stepping them side by side, and time restarting a night."""
+    parser = argparse.ArgumentParser(description="Time simulating many nights side by side in one process.")
+    parser.add_argument("--nights", type=int, nargs="+", default=[1, 10, 100], help="batch sizes to try (larger ones like --nights 500 take several minutes)")
+    args = parser.parse_args(argv)
+
+    sim = Simulation(seed=0)
+    number = 10000
+    restart = timeit.timeit(sim.restart, number=number) / number * 1e6
+    print(f"restart: {restart:.2f} us, GameState: {sys.getsizeof(GameState())} bytes (slots, no __dict__)")
+
+    print(f"{'nights':>7}{'bytes/night':>13}{'one by one ticks/s':>20}{'batch ticks/s':>15}")
+    for count in args.nights:
+        per_night = memory_per_night(count)
+        start = time.perf_counter()
+        ticks = sum(run_night(seed, Autopilot())["ticks"] for seed in range(count))
+        one_by_one = ticks / (time.perf_counter() - start)
+        start = time.perf_counter()
+        results = NightBatch(range(count), [Autopilot() for _ in range(count)]).run()
+        batch = sum(result["ticks"] for result in results) / (time.perf_counter() - start)
+        print(f"{count:>7}{per_night:>13.0f}{one_by_one:>20.0f}{batch:>15.0f}")
+
+if __name__ == "__main__":
+    main()
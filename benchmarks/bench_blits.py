@@ -0,0 +1,53 @@
+import argparse  # Import the argparse library
+import os  # Import the os library
+import timeit  # Import the timeit library
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Run the real game code without a window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # or a sound card
+import FNAFFANGAME as fnaf  # Import the game itself (nothing starts until init())
+from assets import blit_path  # Import how each image is blitted
+
+def blit_time(target, source, number):
+    """Return the time of one blit of source onto target, in microseconds."""
+    return timeit.timeit(lambda: target.blit(source, (0, 0)), number=number) / number * 1e6
+
+def main(argv=None):
+    """Time drawing each image with per-pixel alpha and with the blit the asset cache picked, and the fades and camera views built from them."""
+    parser = argparse.ArgumentParser(description="Compare per-pixel alpha blits with the cheapest blit of each image.")
+    parser.add_argument("--number", type=int, default=2000, help="blits timed per image")
+    args = parser.parse_args(argv)
+
+    fnaf.init()
+    screen = fnaf.screen
+    cache = fnaf.asset_cache
+    print(f"{'image':<44}{'blit':>10}{'per-pixel us':>14}{'picked us':>11}{'speed-up':>10}")
+    entries = fnaf.WARM_UP_ASSETS[:3] + [fnaf.OBSTACLE_IMAGES[0], fnaf.OBSTACLE_IMAGES[-1]] + fnaf.PREFETCH_ASSETS
+    for path, size, alpha in entries:
+        picked = cache.load(path, size, alpha)
+        per_pixel = cache.decode(path, size, alpha)  # Loaded the way it was before, without picking a blit
+        before, after = blit_time(screen, per_pixel, args.number), blit_time(screen, picked, args.number)
+        print(f"{f'{path} {size[0]}x{size[1]}':<44}{blit_path(picked):>10}{before:>14.2f}{after:>11.2f}{before / after:>9.1f}x")
+
+    # Obstacles fading in and out: set_alpha on a copy of the per-pixel image, or the baked fade ramp
+    path, size, _ = fnaf.OBSTACLE_IMAGES[-1]
+    surface_alpha = cache.decode(path, size)
+    surface_alpha.set_alpha(128)
+    baked = cache.load_faded(path, size, 128, fnaf.FADE_RAMP_STEP)
+    before, after = blit_time(screen, surface_alpha, args.number), blit_time(screen, baked, args.number)
+    print(f"{f'faded obstacle {size[0]}x{size[1]} at alpha 128':<44}{blit_path(baked):>10}{before:>14.2f}{after:>11.2f}{before / after:>9.1f}x")
+
+    # Flashlight on an enemy: black screen, enemy, flashlight overlay every frame, or the camera view baked into one image
+    enemy = fnaf.enemies[0]
+    layers = fnaf.camera_layers([enemy], True)
+    overlays = [cache.decode(*layer) for layer in layers]
+    def layered():
+        screen.fill((0, 0, 0))
+        for overlay in overlays:
+            screen.blit(overlay, (0, 0))
+    composite = cache.load_composite(layers, (fnaf.SCREEN_WIDTH, fnaf.SCREEN_HEIGHT))
+    number = max(args.number // 10, 1)
+    before = timeit.timeit(layered, number=number) / number * 1e6
+    after = blit_time(screen, composite, number)
+    print(f"{f'{enemy.name} camera with the flashlight':<44}{blit_path(composite):>10}{before:>14.2f}{after:>11.2f}{before / after:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
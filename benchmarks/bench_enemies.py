@@ -0,0 +1,62 @@
+import argparse  # Import the argparse library
+import random  # Import the random library
+import time  # Import the time library
+from simulation import CAMERAS, TICK_MS, Animatronic  # Import the enemy timing rules
+from scheduler import EnemyScheduler  # Import the enemy wake-up scheduler
+
+def make_roster(count, seed):
+    """Return count enemies spread over the cameras, with the game's random cooldowns."""
+    rng = random.Random(seed)
+    return [Animatronic(CAMERAS[index % len(CAMERAS)], rng, f"enemy {index}") for index in range(count)]
+
+def run_polling(enemies, ticks):
+    """Time the loop step() used to run: check every enemy's cooldown and stay every tick."""
+    start = time.perf_counter()
+    for tick in range(ticks):
+        now = int(tick * TICK_MS)
+        for enemy in enemies:
+            if not enemy.active and now - enemy.last_spawn_time > enemy.cooldown:
+                enemy.spawn(now)
+        for enemy in enemies:
+            if enemy.active and now - enemy.spawn_time > enemy.spawn_duration:
+                enemy.despawn(now)  # Chased away instead of ending the night, so the roster keeps cycling
+    return (time.perf_counter() - start) / ticks
+
+def run_scheduler(enemies, ticks):
+    """Time the same work done by EnemyScheduler."""
+    scheduler = EnemyScheduler(enemies)
+    scheduler.reset()
+    start = time.perf_counter()
+    for tick in range(ticks):
+        now = int(tick * TICK_MS)
+        enemy = scheduler.wake(now)
+        while enemy:
+            enemy.despawn(now)  # Chased away instead of ending the night, so the roster keeps cycling
+            enemy.jumpscare_played = False
+            scheduler.schedule(enemy)
+            enemy = scheduler.wake(now)  # Other enemies due this tick
+    return (time.perf_counter() - start) / ticks
+
+def state(enemies):
+    """Return when each enemy last spawned and left, to check both loops played the same night."""
+    return [(enemy.active, enemy.spawn_time, enemy.last_spawn_time) for enemy in enemies]
+
+def main(argv=None):
+    """Print the time per tick of polling every enemy and of the timer heap from 2 to 500 enemies."""
+    parser = argparse.ArgumentParser(description="Compare polling every enemy each tick with the timer-heap scheduler.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 10, 50, 100, 500], help="roster sizes to time")
+    parser.add_argument("--ticks", type=int, default=7200, help="ticks simulated per run (7200 = 2 minutes of game time)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the enemy cooldowns")
+    args = parser.parse_args(argv)
+
+    print(f"{'enemies':>8}{'polling us':>12}{'scheduler us':>14}{'speed-up':>10}")
+    for count in args.counts:
+        polled, scheduled = make_roster(count, args.seed), make_roster(count, args.seed)
+        polling_time = run_polling(polled, args.ticks)
+        scheduler_time = run_scheduler(scheduled, args.ticks)
+        print(f"{count:>8}{polling_time * 1e6:>12.2f}{scheduler_time * 1e6:>14.2f}{polling_time / scheduler_time:>9.1f}x")
+        if state(polled) != state(scheduled):
+            print("  warning: the enemies ended up in different states")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse  # Import the argparse library
+import random  # Import the random library
+import time  # Import the time library
+import pygame  # Import the pygame library
+from obstacles import SCALAR_LIMIT, ObstacleStore  # Import the array-backed obstacle store
+
+# Same values as settings.py (not imported so no window is opened)
+FADE_X = 230  # BOX_X + 30, obstacles fade out past this point
+SPAWN_X, GROUND_Y = 580, 350  # Where obstacles spawn
+DINO = pygame.Rect(300, 200, 40, 60)  # Dinosaur hitbox, mid-jump so every obstacle is checked each frame
+SPEED = 5  # base_obstacle_speed
+
+def obstacle_images():
+    """Return a function giving a cached obstacle image per (height, alpha)."""
+    images = {}
+    def image_for(height, alpha):
+        image = images.get((height, alpha))
+        if image is None:
+            image = pygame.Surface((20, height), pygame.SRCALPHA)
+            image.fill((120, 60, 20, 255))
+            image.set_alpha(max(0, min(alpha, 255)))
+            images[(height, alpha)] = image
+        return image
+    return image_for
+
+def random_obstacle(rng, x=None):
+    """Return (x, y, w, h) for an obstacle somewhere along the track."""
+    height = rng.randint(20, 60)
+    return (rng.randint(FADE_X, SPAWN_X) if x is None else x), GROUND_Y - height, 20, height
+
+def run_list(count, frames, screen, image_for, rng):
+    """Time the list-of-dicts obstacle loop main() used to run."""
+    obstacles = []
+    for _ in range(count):
+        x, y, w, h = random_obstacle(rng)
+        obstacles.append({'rect': pygame.Rect(x, y, w, h), 'alpha': 0})
+    start = time.perf_counter()
+    for _ in range(frames):
+        removed = 0
+        for obstacle in list(obstacles):
+            obstacle['rect'].x -= SPEED
+            if obstacle['rect'].right < FADE_X:
+                obstacle['alpha'] -= 68
+                if obstacle['alpha'] <= 0:
+                    obstacles.remove(obstacle)
+                    removed += 1
+                    continue
+            elif obstacle['alpha'] < 255:
+                obstacle['alpha'] += 10
+            if DINO.colliderect(obstacle['rect']):
+                obstacles.remove(obstacle)
+                removed += 1
+                break
+        for _ in range(removed):
+            x, y, w, h = random_obstacle(rng, SPAWN_X)  # Keep the number of live obstacles steady
+            obstacles.append({'rect': pygame.Rect(x, y, w, h), 'alpha': 0})
+        for obstacle in obstacles if screen else ():
+            screen.blit(image_for(obstacle['rect'].height, obstacle['alpha']), obstacle['rect'].topleft)
+    return (time.perf_counter() - start) / frames
+
+def run_store(count, frames, screen, image_for, rng, scalar_limit=SCALAR_LIMIT):
+    """Time the same work done by ObstacleStore (scalar_limit=0 always uses NumPy, even for a few obstacles)."""
+    store = ObstacleStore(scalar_limit=scalar_limit)
+    for _ in range(count):
+        store.add(*random_obstacle(rng))
+    start = time.perf_counter()
+    for _ in range(frames):
+        removed, hit = store.advance(SPEED, FADE_X, DINO)
+        if hit != -1:
+            store.remove(hit)
+            removed += 1
+        for _ in range(removed):
+            store.add(*random_obstacle(rng, SPAWN_X))  # Keep the number of live obstacles steady
+        if screen:
+            screen.blits(store.blit_sequence(image_for), doreturn=False)
+    return (time.perf_counter() - start) / frames
+
+def main(argv=None):
+    """Print the time per frame of both obstacle systems from 1 to 10,000 live obstacles."""
+    parser = argparse.ArgumentParser(description="Compare the list and array obstacle systems.")
+    parser.add_argument("--frames", type=int, default=200, help="frames simulated per obstacle count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 3, 10, 30, 100, 1000, 10000], help="live obstacle counts")
+    parser.add_argument("--no-draw", action="store_true", help="only time the update and collision work")
+    args = parser.parse_args(argv)
+
+    screen = None if args.no_draw else pygame.Surface((800, 600))  # Off-screen target, no window needed
+    image_for = obstacle_images()
+    print(f"{'obstacles':>10} {'list ms':>10} {'arrays ms':>10} {'store ms':>10} {'speedup':>8}")  # arrays: NumPy at every count
+    for count in args.counts:
+        list_time = run_list(count, args.frames, screen, image_for, random.Random(count))
+        array_time = run_store(count, args.frames, screen, image_for, random.Random(count), scalar_limit=0)
+        store_time = run_store(count, args.frames, screen, image_for, random.Random(count))
+        print(f"{count:>10} {list_time * 1000:>10.3f} {array_time * 1000:>10.3f} {store_time * 1000:>10.3f} {list_time / store_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
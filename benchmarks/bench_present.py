@@ -0,0 +1,78 @@
+import argparse  # Import the argparse library
+import os  # Import the os library
+import time  # Import the time library
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Run the real game code without a window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # or a sound card
+import pygame  # Import the pygame library
+import FNAFFANGAME as fnaf  # Import the game itself (nothing starts until init())
+from simulation import Autopilot  # Import the bot that plays the dinosaur game
+
+MODES = {  # Name: (dirty rectangles and the scaled frame cache, scale the whole screen every frame)
+    "scale every frame": False,  # One final scale of the whole screen per frame
+    "dirty + cache": True,  # The renderer as the game runs it
+}
+
+def run_mode(window, frames, dirty):
+    """Play the night with the bot in a window of the given size and return the present time of each kind of frame."""
+    renderer = fnaf.renderer
+    renderer.enabled = dirty
+    renderer.frame_cache_bytes = fnaf.SCALED_FRAME_CACHE_BYTES if dirty else 0
+    renderer.resize(window)
+    fnaf.game.new_night(0)
+    fnaf.current_frame_index, fnaf.animation_timer = 0, 0  # Same dinosaur animation in every mode
+    bot = Autopilot()
+    times = {"changed regions": [], "camera switch": [], "cached switch": []}
+    for frame in range(frames):
+        outcome = fnaf.game.step(bot(fnaf.game))
+        fnaf.game.clock.advance()
+        if outcome:
+            fnaf.game.retry()
+            renderer.invalidate()
+        if frame % 240 >= 200:
+            fnaf.game.current_pov = "left" if frame % 240 < 220 else "right"  # Look at the side cameras for a moment every 4 seconds
+        fnaf.draw_frame()
+        full, cached = renderer.full_redraw, renderer.cached_frames
+        start = time.perf_counter()
+        renderer.present()
+        elapsed = time.perf_counter() - start
+        if not full:
+            times["changed regions"].append(elapsed)
+        elif renderer.cached_frames > cached:
+            times["cached switch"].append(elapsed)
+        else:
+            times["camera switch"].append(elapsed)  # Scaled in one go (or copied at the game's own size)
+
+    # The jumpscare, win and game over screens have no view: scaled every time they are drawn
+    jumpscare = []
+    for _ in range(20):
+        renderer.screen.fill((0, 0, 0))
+        renderer.invalidate()
+        start = time.perf_counter()
+        renderer.present()
+        jumpscare.append(time.perf_counter() - start)
+    times["jumpscare"] = jumpscare
+    return {kind: (sum(values) / len(values) * 1000, len(values)) if values else (0.0, 0) for kind, values in times.items()}
+
+def main(argv=None):
+    """Time pushing frames to windows from the game's size to 4K, scaling every frame and with dirty rectangles and the frame cache."""
+    parser = argparse.ArgumentParser(description="Compare scaling every frame to the window with scaling only the changed regions.")
+    parser.add_argument("--frames", type=int, default=1800, help="frames played per window size and mode (1800 = 30 seconds)")
+    parser.add_argument("--sizes", nargs="+", default=["800x600", "1920x1080", "3840x2160"], help="window sizes, WIDTHxHEIGHT")
+    parser.add_argument("--nearest", action="store_true", help="nearest pixel scaling instead of smooth scaling")
+    args = parser.parse_args(argv)
+
+    fnaf.init()
+    fnaf.renderer.smooth = not args.nearest
+    kinds = ["changed regions", "camera switch", "cached switch", "jumpscare"]
+    print(f"{'window':<11}{'mode':<19}" + "".join(f"{kind + ' ms':>20}" for kind in kinds) + f"{'mean ms':>10}")
+    for size in args.sizes:
+        window = pygame.display.set_mode(tuple(int(value) for value in size.split("x")))
+        for name, dirty in MODES.items():
+            result = run_mode(window, args.frames, dirty)
+            count = sum(result[kind][1] for kind in kinds[:3])
+            mean = sum(result[kind][0] * result[kind][1] for kind in kinds[:3]) / count
+            cells = "".join(f"{result[kind][0]:>13.3f} ({result[kind][1]:>4})" for kind in kinds)
+            print(f"{size:<11}{name:<19}{cells}{mean:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse  # Import the argparse library
+import json  # Import the json library
+import statistics  # Import the statistics library
+import os  # Import the os library
+import subprocess  # Import the subprocess library
+import sys  # Import the sys library
+import time  # Import the time library
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Run the real game code without a window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")  # or a sound card
+import numpy  # Import the numpy library
+import pygame  # Import the pygame library
+import FNAFFANGAME as fnaf  # Import the game itself (nothing starts until init())
+from simulation import Autopilot  # Import the bot that plays the dinosaur game
+from assets import surface_bytes  # Helper to measure surface memory
+
+SCENES = ["center", "left_enemy", "right_flashlight", "dense_obstacles", "jumpscare", "game_over"]
+HIGHER_IS_WORSE = ["p50_ms", "p95_ms"]  # Frame time metrics compared with --threshold (p99 is reported, but too noisy to gate on)
+MEMORY = ["peak_rss", "surface_bytes"]  # Memory metrics compared with --memory-threshold
+MIN_SLOWDOWN_MS = 0.05  # Frame time differences smaller than this are noise, even if they are a large fraction
+
+def keep_enemies_away():
+    """Stop the enemies from spawning on their own so a scene isn't cut short by a jumpscare."""
+    for enemy in fnaf.game.enemies:
+        enemy.despawn(fnaf.game.clock())
+        enemy.cooldown = float("inf")
+    fnaf.game.scheduler.reset()  # Take the changed timers into account
+
+def enemy_on(camera):
+    """Return the first enemy of the roster that watches a camera."""
+    return next(enemy for enemy in fnaf.enemies if enemy.screen_name == camera)
+
+def show_enemy(enemy):
+    """Make an enemy appear and stay for the whole scene."""
+    enemy.active = True
+    enemy.spawn_time = fnaf.game.clock()
+    enemy.spawn_duration = float("inf")
+    fnaf.game.scheduler.schedule(enemy)  # Put it on its camera
+
+def play_scene(pov="center"):
+    """Return a fresh PlayScene looking at the given camera with the enemies kept away."""
+    fnaf.restart_dinosaur_game()
+    fnaf.game.held.clear()
+    fnaf.game.flashlight = False
+    keep_enemies_away()
+    fnaf.game.current_pov = pov
+    return fnaf.PlayScene()
+
+def setup(name):
+    """Return the scene to play and a function giving the key events of each frame."""
+    no_input = lambda scene: ()
+    if name == "center":
+        bot = Autopilot()
+        return play_scene(), lambda scene: bot(fnaf.game)  # The bot jumps over the obstacles
+    if name == "left_enemy":
+        scene = play_scene("left")
+        show_enemy(enemy_on("left"))
+        return scene, no_input
+    if name == "right_flashlight":
+        scene = play_scene("right")
+        show_enemy(enemy_on("right"))
+        fnaf.game.held.add(pygame.K_f)  # Flashlight held, but not long enough to chase the enemy away
+        fnaf.game.flashlight = True
+        return scene, no_input
+    if name == "dense_obstacles":
+        scene = play_scene()
+        def crowd(scene):
+            obstacles = fnaf.game.obstacles
+            while len(obstacles) < 200:
+                height = fnaf.game.rng.randint(fnaf.OBSTACLE_MIN_HEIGHT, fnaf.OBSTACLE_MAX_HEIGHT)
+                obstacles.add(fnaf.game.rng.randint(fnaf.BOX_X + 30, 580), 350 - height, fnaf.OBSTACLE_WIDTH, height)
+            return ()
+        return scene, crowd
+    if name == "jumpscare":
+        enemy = enemy_on("left")
+        enemy.load_jumpscare()
+        return fnaf.JumpscareScene(enemy.jumpscare, None, lambda: None), no_input
+    if name == "game_over":
+        return fnaf.GameOverScene(fnaf.retry), no_input
+    raise ValueError(f"Unknown scene {name}")
+
+def surface_memory():
+    """Return the memory held by cached images, rendered text and decoded jumpscare frames."""
+    total = fnaf.asset_cache.bytes_used
+    total += sum(surface_bytes(surface) for surface in fnaf.text_cache.surfaces.values())
+    total += sum(enemy.jumpscare.peak_bytes for enemy in fnaf.game.enemies if enemy.jumpscare)
+    return total
+
+def peak_rss():
+    """Return the most memory the process has used, in bytes, or 0 where it can't be measured."""
+    try:
+        import resource
+    except ImportError:
+        return 0  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Kilobytes on Linux
+
+def run_scene(name, frames, warm_up):
+    """Play a scene for a number of frames as fast as possible and return its measurements."""
+    fnaf.init()
+    scene, inputs = setup(name)
+    scene_frame = 0  # Frames since the scene was (re)started, drives its clock
+    times = []
+    for frame in range(warm_up + frames):
+        start = time.perf_counter()
+        scene.start_time = pygame.time.get_ticks() - int(scene_frame * 1000 / fnaf.FPS)  # Every frame is one 60 FPS frame later
+        if isinstance(scene, fnaf.PlayScene):
+            scene.lag = fnaf.TICK_MS  # Exactly one game tick per frame
+        events = [pygame.event.Event(kind, key=key) for kind, key in inputs(scene)]
+        next_scene = scene.update(events)
+        if next_scene is scene:
+            scene.draw()
+            scene_frame += 1
+        else:
+            scene, inputs = setup(name)  # The scene ended (e.g. the jumpscare finished): play it again
+            scene_frame = 0
+        if frame >= warm_up:
+            times.append(time.perf_counter() - start)
+    times = numpy.array(times) * 1000
+    p50, p95, p99 = numpy.percentile(times, [50, 95, 99])
+    return {
+        "fps": float(len(times) / times.sum() * 1000),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "peak_rss": peak_rss(),
+        "surface_bytes": surface_memory(),
+    }
+
+def run_child(name, frames, warm_up):
+    """Run one scene in a fresh process so its memory is measured on its own."""
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_scenes", "--child", name, "--frames", str(frames), "--warm-up", str(warm_up)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Return a list of (scene, metric, baseline, result) for every metric worse than the baseline by more than the threshold."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue  # New scene, nothing to compare with
+        if slower(1000 / base["fps"], 1000 / result["fps"], threshold):  # Compare the mean frame times
+            regressions.append((name, "fps", base["fps"], result["fps"]))
+        for metric in HIGHER_IS_WORSE:
+            if slower(base[metric], result[metric], threshold):
+                regressions.append((name, metric, base[metric], result[metric]))
+        for metric in MEMORY:
+            if base[metric] and result[metric] > base[metric] * (1 + memory_threshold):
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+def slower(base_ms, result_ms, threshold):
+    """Return True if result_ms is slower than base_ms by more than threshold and by more than MIN_SLOWDOWN_MS."""
+    return result_ms > base_ms * (1 + threshold) and result_ms - base_ms > MIN_SLOWDOWN_MS
+
+def main(argv=None):
+    """Play every scene, print the results and exit with 1 if any scene regressed against the baseline."""
+    parser = argparse.ArgumentParser(description="Time the game's scenes under the SDL dummy drivers and compare them with a baseline.")
+    parser.add_argument("--frames", type=int, default=600, help="frames timed per scene")
+    parser.add_argument("--warm-up", type=int, default=60, help="frames played before timing starts (images load here)")
+    parser.add_argument("--repeats", type=int, default=3, help="runs per scene, the median of each measurement is kept")
+    parser.add_argument("--scenes", nargs="+", choices=SCENES, default=SCENES, help="scenes to play")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown of fps and frame times (0.2 = 20%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.1, help="allowed growth of peak RSS and surface memory")
+    parser.add_argument("--child", choices=SCENES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        print(json.dumps(run_scene(args.child, args.frames, args.warm_up)))
+        return 0
+
+    results = {}
+    print(f"{'scene':<18}{'fps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak RSS MB':>13}{'surfaces MB':>13}")
+    for name in args.scenes:
+        runs = [run_child(name, args.frames, args.warm_up) for _ in range(args.repeats)]
+        result = results[name] = {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+        print(f"{name:<18}{result['fps']:>9.0f}{result['p50_ms']:>9.3f}{result['p95_ms']:>9.3f}{result['p99_ms']:>9.3f}"
+              f"{result['peak_rss'] / 1024 / 1024:>13.1f}{result['surface_bytes'] / 1024 / 1024:>13.1f}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(results, file, indent=2)
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file), args.threshold, args.memory_threshold)
+    for name, metric, base, result in regressions:
+        print(f"REGRESSION {name} {metric}: {base:.3f} -> {result:.3f}")
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import argparse  # Import the argparse library
+import sys  # Import the sys library
+import time  # Import the time library
+import tracemalloc  # Import the tracemalloc library
+from simulation import Autopilot, Simulation  # Import the game rules and the bot
+
+def play(sim, bot, ticks):
+    """Step the night with the bot for a number of ticks, retrying after a jumpscare so the obstacles keep coming."""
+    for _ in range(ticks):
+        outcome = sim.step(bot(sim))
+        sim.clock.advance()
+        if outcome == "win":
+            sim.new_night(sim.seed + 1)
+        elif outcome:
+            sim.retry()
+
+def main(argv=None):
+    """Play the dinosaur game and count the obstacle pool allocations and the memory left behind per tick."""
+    parser = argparse.ArgumentParser(description="Check that spawning obstacles allocates nothing once the game is running.")
+    parser.add_argument("--ticks", type=int, default=36000, help="ticks measured (36000 = 10 minutes of game time)")
+    parser.add_argument("--warm-up", type=int, default=600, help="ticks played before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the night")
+    args = parser.parse_args(argv)
+
+    sim, bot = Simulation(seed=args.seed), Autopilot()
+    play(sim, bot, args.warm_up)
+    allocations, spawned = sim.obstacles.allocations, sim.spawner.spawned
+
+    start = time.perf_counter()
+    play(sim, bot, args.ticks)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    play(sim, bot, args.ticks)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    pool_allocations = sim.obstacles.allocations - allocations
+    print(f"{args.ticks * 2} ticks, {sim.spawner.spawned - spawned} obstacles spawned, {args.ticks / elapsed:.0f} ticks/s")
+    print(f"obstacle pool allocations: {pool_allocations} ({pool_allocations / (args.ticks * 2):.4f} per tick)")
+    print(f"memory left behind: {retained} bytes ({retained / args.ticks:.2f} per tick)")
+    return 1 if pool_allocations else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import argparse  # Import the argparse library
+import json  # Import the json library
+import os  # Import the os library
+import statistics  # Import the statistics library
+import subprocess  # Import the subprocess library
+import sys  # Import the sys library
+import time  # Import the time library
+from settings import *  # Import all constants and libraries from settings.py
+from jumpscare import JumpscarePlayer  # Import the jumpscare frame streamer
+
+LOADERS = ["files", "pack"]  # Image files decoded and scaled at startup, or the asset pack mapped
+
+def load_everything(loader):
+    """Load the game's images with the given loader and return the milliseconds taken per group."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No visible window needed
+    init_display()
+    times = {}
+
+    start = time.perf_counter()
+    if loader == "pack" and open_asset_pack() is None:
+        raise SystemExit("No asset pack, run 'python build_assets.py' first")
+    asset_cache.warm_up(WARM_UP_ASSETS)  # What init() loads before the first frame
+    asset_cache.load_frames(sprite_sheet_path, DINO_SHEET_GRID, DINO_RUN_FRAMES + [DINO_JUMP_FRAME], (DINOSAUR_WIDTH, DINOSAUR_HEIGHT))
+    times["first_frame"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asset_cache.warm_up(PREFETCH_ASSETS)  # What the prefetch thread loads after the first frame
+    times["prefetch"] = time.perf_counter() - start
+
+    target = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))  # Frames are drawn so mapped pages are really read
+    start = time.perf_counter()
+    for path, (cols, rows, total_frames) in JUMPSCARE_SHEETS.items():
+        if os.path.exists(path):
+            player = JumpscarePlayer(path, cols, rows, total_frames, (SCREEN_WIDTH, SCREEN_HEIGHT), pack=asset_cache.pack)
+            for index in range(player.frame_count):
+                target.blit(player.frame(index), (0, 0))  # Play the whole jumpscare
+    times["jumpscares"] = time.perf_counter() - start
+    return {name: seconds * 1000 for name, seconds in times.items()}
+
+def drop_from_page_cache(paths):
+    """Ask the OS to forget the cached contents of files so the next read comes from the disk."""
+    for path in paths:
+        if os.path.exists(path):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+def run_child(loader):
+    """Time one start in a fresh process (nothing decoded or mapped yet) and return its timings."""
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_startup", "--child", loader],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(argv=None):
+    """Print the median cold and warm start times of the image files and of the asset pack."""
+    parser = argparse.ArgumentParser(description="Compare loading the images from files and from the asset pack.")
+    parser.add_argument("--runs", type=int, default=5, help="starts timed per loader and cache state")
+    parser.add_argument("--child", choices=LOADERS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        print(json.dumps(load_everything(args.child)))
+        return
+
+    files = [entry.path for entry in os.scandir("images") if entry.is_file()] + [ASSET_PACK_PATH]
+    cold = hasattr(os, "posix_fadvise")  # Without it only warm starts can be measured
+    print(f"{'loader':<8}{'cache':<7}{'first frame ms':>16}{'prefetch ms':>13}{'jumpscares ms':>15}")
+    for loader in LOADERS:
+        for state in ["cold", "warm"] if cold else ["warm"]:
+            runs = []
+            for _ in range(args.runs):
+                if state == "cold":
+                    drop_from_page_cache(files)
+                runs.append(run_child(loader))
+            median = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+            print(f"{loader:<8}{state:<7}{median['first_frame']:>16.1f}{median['prefetch']:>13.1f}{median['jumpscares']:>15.1f}")
+
+if __name__ == "__main__":
+    main()
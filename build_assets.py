@@ -0,0 +1,44 @@
+import argparse  # Import the argparse library
+import os  # Import the os library
+import time  # Import the time library
+from settings import *  # Import all constants and libraries from settings.py
+from assetpack import write_pack  # Import the asset pack writer
+from jumpscare import JumpscarePlayer  # Import the jumpscare frame streamer
+
+def pack_contents(jumpscares=True):
+    """Decode every image the game uses at its final size, the same way the game does, as (key, surface) pairs."""
+    images = []
+    for path, size, alpha in WARM_UP_ASSETS + PREFETCH_ASSETS:
+        images.append(((path, size, alpha), asset_cache.decode(path, size, alpha)))
+
+    dino_size = (DINOSAUR_WIDTH, DINOSAUR_HEIGHT)
+    indices = DINO_RUN_FRAMES + [DINO_JUMP_FRAME]
+    for index, frame in zip(indices, asset_cache.decode_frames(sprite_sheet_path, DINO_SHEET_GRID, indices, dino_size)):
+        images.append(((sprite_sheet_path, dino_size, True, index), frame))
+
+    for path, (cols, rows, total_frames) in JUMPSCARE_SHEETS.items() if jumpscares else ():
+        if not os.path.exists(path):
+            print(f"Skipping missing jumpscare sheet {path}")
+            continue
+        player = JumpscarePlayer(path, cols, rows, total_frames, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        for index in range(player.frame_count):
+            images.append((player.key(index), player.cut(index)))
+    return images
+
+def main(argv=None):
+    """Bake every image the game uses into the asset pack."""
+    parser = argparse.ArgumentParser(description="Build the asset pack the game maps at startup instead of decoding images.")
+    parser.add_argument("--output", default=ASSET_PACK_PATH, help="pack file to write")
+    parser.add_argument("--no-jumpscares", action="store_true", help="leave out the jumpscare frames (about 2 MB each)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Converting needs a display, but not a visible window
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    start = time.perf_counter()
+    images = pack_contents(not args.no_jumpscares)
+    size = write_pack(args.output, images)
+    print(f"Wrote {len(images)} images ({size / 1024 / 1024:.1f} MB) to {args.output} in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import pygame  # Import the pygame library
+from collections import OrderedDict  # Ordered dictionary used as the frame ring buffer
+from assets import frame_area, surface_bytes  # Helpers to find frames in a sheet and measure surface memory
+
+class JumpscarePlayer:
+    """Stream jumpscare frames from a sprite sheet, decoding and scaling them just ahead of playback."""
+
+    def __init__(self, sheet_path, cols, rows, total_frames, size, eager=False, buffer_size=4, pack=None):
+        self.sheet_path = sheet_path  # Sprite sheet holding every frame
+        self.sheet = None  # Compact source sheet in its original pixel format, only decoded if the pack can't supply a frame
+        self.pack = pack  # Asset pack holding the frames already scaled, or None
+        self.size = tuple(size)  # Size each frame is scaled to
+        self.buffer_size = buffer_size  # Number of decoded frames kept in the ring buffer
+        self.cols, self.rows = cols, rows
+        self.frame_count = min(total_frames, cols * rows)  # Number of frames actually present in the sheet
+        if not (pack and pack.has(self.key(0))):
+            self.load_sheet()  # Fail now rather than during the jumpscare if the sheet is missing
+        self.frames = OrderedDict()  # Decoded frames by index, oldest first
+        self.eager = eager  # Keep every frame decoded instead of streaming
+        self.decoded = 0  # Number of frames decoded so far
+        self.peak_bytes = self.resident_bytes()  # Highest memory use seen so far
+        if eager:
+            for index in range(self.frame_count):
+                self.decode(index)  # Decode every frame up front
+
+    def load_sheet(self):
+        """Decode the source sheet."""
+        if self.sheet is None:
+            self.sheet = pygame.image.load(self.sheet_path)  # Keep the compact source sheet in its original pixel format
+        return self.sheet
+
+    def key(self, index):
+        """Return the asset pack key of frame index."""
+        return (self.sheet_path, self.size, True, index)
+
+    def cut(self, index):
+        """Cut one frame out of the sheet, scale it to the screen and match the display format."""
+        sheet = self.load_sheet()
+        return pygame.transform.scale(sheet.subsurface(frame_area(sheet.get_size(), self.cols, self.rows, index)), self.size).convert_alpha()
+
+    def decode(self, index):
+        """Get one frame from the asset pack, or cut it out of the sheet, and store it in the buffer."""
+        frame = self.pack.surface(self.key(index)) if self.pack else None  # Already scaled, nothing to decode
+        if frame is None:
+            frame = self.cut(index)
+        self.frames[index] = frame
+        self.decoded += 1
+        if not self.eager:
+            while len(self.frames) > self.buffer_size:
+                self.frames.popitem(last=False)  # Drop the oldest frame from the ring buffer
+        self.peak_bytes = max(self.peak_bytes, self.resident_bytes())
+        return frame
+
+    def prefetch(self, index, ahead=2):
+        """Decode the frames that follow index so they are ready when playback reaches them."""
+        for next_index in range(index, min(index + ahead + 1, self.frame_count)):
+            if next_index not in self.frames:
+                self.decode(next_index)
+
+    def frame(self, index):
+        """Return the decoded frame at index and prefetch the next ones."""
+        frame = self.frames.get(index)
+        if frame is None:
+            frame = self.decode(index)
+        if not self.eager:
+            self.prefetch(index + 1, self.buffer_size - 2)  # Keep the frame being shown plus the next ones in the buffer
+        return frame
+
+    def release(self):
+        """Drop the decoded frames once playback has finished."""
+        if not self.eager:
+            self.frames.clear()
+
+    def resident_bytes(self):
+        """Return the memory used by the source sheet and the decoded frames."""
+        return (surface_bytes(self.sheet) if self.sheet else 0) + sum(surface_bytes(frame) for frame in self.frames.values())
+
+    def stats(self):
+        """Return the player counters as a dictionary."""
+        return {
+            "frames": self.frame_count,
+            "decoded": self.decoded,
+            "buffered": len(self.frames),
+            "bytes": self.resident_bytes(),
+            "peak_bytes": self.peak_bytes,
+        }
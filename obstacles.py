@@ -0,0 +1,220 @@
+import numpy as np  # Import the numpy library
+
+SCALAR_LIMIT = 32  # Up to this many live obstacles a plain loop is faster than NumPy's per-call overhead
+
+class ObstacleStore:
+    """Obstacles kept as parallel arrays (x, y, w, h, alpha, alive) so they can be updated in one go."""
+
+    def __init__(self, capacity=16, scalar_limit=SCALAR_LIMIT):
+        self.count = 0  # Number of live obstacles, stored at indexes 0 to count - 1
+        self.allocations = 0  # Times the arrays were created, stays at 1 while the pool is big enough
+        self.scalar_limit = scalar_limit  # Live obstacles up to which the store loops over them instead of using NumPy
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """Create (or grow) the arrays, keeping the live obstacles."""
+        old = getattr(self, "x", None)
+        arrays = {}
+        for name, dtype in (("x", np.int32), ("y", np.int32), ("w", np.int32), ("h", np.int32), ("alpha", np.int32), ("alive", np.bool_)):
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]  # Copy the live obstacles over
+            arrays[name] = array
+        self.x, self.y, self.w, self.h = arrays["x"], arrays["y"], arrays["w"], arrays["h"]
+        self.alpha, self.alive = arrays["alpha"], arrays["alive"]
+        # Memoryviews of the same arrays: indexing them gives plain ints, much cheaper than NumPy scalars in a loop
+        self.views = tuple(memoryview(array) for array in (self.x, self.y, self.w, self.h, self.alpha, self.alive))
+        self.capacity = capacity
+        self.allocations += 1
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Remove every obstacle."""
+        self.count = 0
+
+    def add(self, x, y, w, h, alpha=0):
+        """Add an obstacle and return its index."""
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)  # Double the arrays when full
+        index = self.count
+        xs, ys, ws, hs, alphas, alive = self.views
+        xs[index], ys[index], ws[index], hs[index] = x, y, w, h
+        alphas[index] = alpha
+        alive[index] = True
+        self.count += 1
+        return index
+
+    def update(self, speed, fade_x, fade_out=68, fade_in=10):
+        """Move every obstacle left, fade them in or out and cull the faded ones. Return how many were culled."""
+        n = self.count
+        if not n:
+            return 0
+        if n <= self.scalar_limit:
+            return self.update_few(speed, fade_x, fade_out, fade_in)
+        x, alpha = self.x[:n], self.alpha[:n]
+        x -= speed  # Move obstacles to the left
+        fading = x + self.w[:n] < fade_x  # Obstacles near the left edge of the box fade out
+        if not fading.any():
+            alpha[alpha < 255] += fade_in  # Fade in until fully opaque
+            return 0
+        alpha[fading] -= fade_out
+        alpha[~fading & (alpha < 255)] += fade_in  # The others fade in until fully opaque
+        faded = fading & (alpha <= 0)
+        if not faded.any():
+            return 0
+        self.alive[:n] = ~faded
+        culled = int(faded.sum())
+        self.compact()
+        return culled
+
+    def update_few(self, speed, fade_x, fade_out, fade_in):
+        """update() for a few obstacles, one at a time."""
+        xs, _, ws, _, alphas, alive = self.views
+        culled = 0
+        for index in range(self.count):
+            x = xs[index] = xs[index] - speed  # Move the obstacle to the left
+            alpha = alphas[index]
+            if x + ws[index] < fade_x:
+                alpha = alphas[index] = alpha - fade_out  # Near the left edge of the box: fade out
+                if alpha <= 0:
+                    alive[index] = False
+                    culled += 1
+            elif alpha < 255:
+                alphas[index] = alpha + fade_in  # Fade in until fully opaque
+        if culled:
+            self.compact()
+        return culled
+
+    def advance(self, speed, fade_x, rect, fade_out=68, fade_in=10):
+        """update() then collide(rect) in one pass over the obstacles. Return (obstacles culled, index hit or -1)."""
+        if self.count > self.scalar_limit:
+            culled = self.update(speed, fade_x, fade_out, fade_in)
+            return culled, self.collide(rect)
+        xs, ys, ws, hs, alphas, alive = self.views
+        left, right, top, bottom = rect.left, rect.right, rect.top, rect.bottom
+        culled, hit = 0, -1
+        for index in range(self.count):
+            x = xs[index] = xs[index] - speed  # Move the obstacle to the left
+            w, alpha = ws[index], alphas[index]
+            if x + w < fade_x:
+                alpha = alphas[index] = alpha - fade_out  # Near the left edge of the box: fade out
+                if alpha <= 0:
+                    alive[index] = False
+                    culled += 1
+                    continue
+            elif alpha < 255:
+                alphas[index] = alpha + fade_in  # Fade in until fully opaque
+            if hit == -1 and x < right and x + w > left:
+                y = ys[index]
+                if y < bottom and y + hs[index] > top:
+                    hit = index  # First overlapping obstacle
+        if culled:
+            self.compact()  # Moves obstacles around, so look for the hit again
+            hit = self.collide(rect)
+        return culled, hit
+
+    def collide(self, rect):
+        """Return the index of an obstacle overlapping rect, or -1 if there is none."""
+        n = self.count
+        if not n:
+            return -1
+        if n <= self.scalar_limit:
+            xs, ys, ws, hs, _, _ = self.views
+            left, right, top, bottom = rect.left, rect.right, rect.top, rect.bottom
+            for index in range(n):
+                x, y = xs[index], ys[index]
+                if x < right and x + ws[index] > left and y < bottom and y + hs[index] > top:
+                    return index  # First overlapping obstacle
+            return -1
+        x, y = self.x[:n], self.y[:n]
+        hits = (x < rect.right) & (x + self.w[:n] > rect.left) & (y < rect.bottom) & (y + self.h[:n] > rect.top)  # Axis-aligned box overlap
+        index = int(hits.argmax())  # First overlapping obstacle (or 0 if none overlap)
+        return index if hits[index] else -1
+
+    def remove(self, index):
+        """Remove one obstacle by moving the last one into its slot."""
+        last = self.count - 1
+        for view in self.views:
+            view[index] = view[last]
+        self.count = last
+
+    def compact(self):
+        """Remove every obstacle marked as not alive, filling the holes from the end of the arrays."""
+        n = self.count
+        if n <= self.scalar_limit:
+            alive = self.views[5]
+            remaining = sum(alive[:n])
+            movers = (index for index in range(remaining, n) if alive[index])  # Live obstacles past the end of the live range
+            for hole in range(remaining):
+                if not alive[hole]:
+                    mover = next(movers)
+                    for view in self.views:
+                        view[hole] = view[mover]  # Swap a tail obstacle into the hole
+            self.count = remaining
+            return
+        alive = self.alive[:n]
+        remaining = int(alive.sum())
+        holes = np.flatnonzero(~alive[:remaining])  # Dead slots that stay inside the live range
+        movers = np.flatnonzero(alive[remaining:]) + remaining  # Live obstacles past the end of the live range
+        for array in (self.x, self.y, self.w, self.h, self.alpha, self.alive):
+            array[holes] = array[movers]  # Swap the tail obstacles into the holes
+        self.count = remaining
+
+    def any_between(self, left, right):
+        """Return True if an obstacle's left edge is between left (inclusive) and right (exclusive)."""
+        if self.count <= self.scalar_limit:
+            xs = self.views[0]
+            return any(left <= xs[index] < right for index in range(self.count))
+        x = self.x[:self.count]
+        return bool(((x >= left) & (x < right)).any())
+
+    def blit_sequence(self, image_for):
+        """Return (image, position) pairs for Surface.blits, getting each image from image_for(height, alpha)."""
+        n = self.count
+        if not n:
+            return []
+        alpha = np.clip(self.alpha[:n], 0, 255)  # Surface alpha only goes from 0 to 255
+        keys, which = np.unique(self.h[:n] * 256 + alpha, return_inverse=True)  # Look up each (height, alpha) image once
+        images = [image_for(key >> 8, key & 255) for key in keys.tolist()]
+        return list(zip(map(images.__getitem__, which.tolist()), zip(self.x[:n].tolist(), self.y[:n].tolist())))
+
+class ObstacleSpawner:
+    """Spawn schedule of the dinosaur game: the gaps and heights of a night are drawn up front and one deadline is kept."""
+
+    def __init__(self, store, x, ground_y, width):
+        self.store = store  # Obstacles the spawner adds to
+        self.x, self.ground_y, self.width = x, ground_y, width  # Where new obstacles appear and how wide they are
+        self.gaps = np.zeros(0, dtype=np.int32)  # Milliseconds before each obstacle, counted from when the track is clear
+        self.heights = np.zeros(0, dtype=np.int32)  # Height of each obstacle
+        self.next = 0  # Index of the next obstacle in the schedule
+        self.next_time = None  # Game time the next obstacle spawns, None while waiting for the track to clear
+        self.spawned = 0  # Obstacles spawned so far
+
+    def plan(self, rng, count, gap_range, height_range):
+        """Draw the gaps and heights of the next count obstacles (the schedule repeats if a night needs more)."""
+        self.gaps = np.array([rng.randint(*gap_range) for _ in range(count)], dtype=np.int32)
+        self.heights = np.array([rng.randint(*height_range) for _ in range(count)], dtype=np.int32)
+        self.next = 0
+        self.next_time = None
+
+    def arm(self, now):
+        """Start the gap before the next obstacle, unless it is already running."""
+        if self.next_time is None:
+            self.next_time = now + int(self.gaps[self.next])
+
+    def disarm(self):
+        """Forget the running gap (the track was cleared by a restart, not by the player)."""
+        self.next_time = None
+
+    def update(self, now, spawning=True):
+        """Spawn the next obstacle if its time has come, and start the next gap once the track is clear."""
+        if self.next_time is not None and now >= self.next_time and spawning:
+            height = int(self.heights[self.next])
+            self.store.add(self.x, self.ground_y - height, self.width, height)  # Reuses a free slot of the store
+            self.next = (self.next + 1) % len(self.heights)
+            self.next_time = None
+            self.spawned += 1
+        elif self.next_time is None and not self.store.count:
+            self.arm(now)
@@ -0,0 +1,139 @@
+import json  # Import the json library
+import queue  # Import the queue library
+import threading  # Import the threading library
+import time  # Import the time library
+from collections import deque  # Fixed-length queue used for the rolling window
+import numpy  # Import the numpy library
+import pygame  # Import the pygame library
+
+PHASES = ["events", "timer", "obstacles", "enemies", "input", "update", "draw", "loads", "present", "wait"]  # Phases of a frame, in loop order
+
+class FrameProfiler:
+    """Time each phase of every frame and keep rolling percentiles and a count of frames over budget."""
+
+    def __init__(self, fps, window=600, enabled=False, log_path=None):
+        self.budget = 1 / fps  # Seconds a frame may take to keep up with FPS
+        self.enabled = enabled  # Nothing is measured unless profiling is on
+        self.samples = {name: deque(maxlen=window) for name in PHASES + ["work", "frame"]}  # Rolling window of seconds per phase
+        self.current = dict.fromkeys(PHASES, 0.0)  # Seconds spent in each phase this frame
+        self.frame_start = self.last = time.perf_counter()  # Start of the frame and end of the last phase
+        self.frames = 0  # Frames profiled
+        self.dropped = 0  # Frames whose work took longer than the budget
+        self.hud = False  # Whether the overlay is drawn
+        self.hud_surface = None  # Rendered overlay, refreshed a few times a second
+        self.log_path = log_path  # CSV or JSON lines file the samples are written to, or None
+        self.writer = None  # Background log writer, started with the first frame
+
+    def mark(self, phase):
+        """End the current phase: the time since the previous mark is added to phase."""
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[phase] += now - self.last
+            self.last = now
+
+    def split(self, phase, part, seconds):
+        """Move seconds already counted in phase to part (e.g. image loads that happened while drawing)."""
+        if self.enabled and seconds:
+            self.current[phase] -= seconds
+            self.current[part] += seconds
+
+    def end_frame(self):
+        """Record this frame's phase times and start the next frame."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame = now - self.frame_start
+        work = frame - self.current["wait"]  # Time the loop was busy, without sleeping in clock.tick
+        for name, seconds in self.current.items():
+            self.samples[name].append(seconds)
+        self.samples["work"].append(work)
+        self.samples["frame"].append(frame)
+        self.frames += 1
+        if work > self.budget:
+            self.dropped += 1
+        if self.log_path:
+            if self.writer is None:
+                self.writer = SampleWriter(self.log_path)
+            self.writer.put({"frame": self.frames, "frame_ms": frame * 1000, "work_ms": work * 1000,
+                             **{f"{name}_ms": seconds * 1000 for name, seconds in self.current.items()}})
+        if self.hud and self.frames % 30 == 0:
+            self.hud_surface = None  # Render the overlay again with the new numbers
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = now
+
+    def percentiles(self, name):
+        """Return the p50, p95 and p99 of a phase over the rolling window, in milliseconds."""
+        samples = self.samples[name]
+        if not samples:
+            return 0.0, 0.0, 0.0
+        return tuple(float(value) * 1000 for value in numpy.percentile(numpy.fromiter(samples, float, len(samples)), [50, 95, 99]))
+
+    def toggle_hud(self):
+        """Show or hide the overlay."""
+        self.hud = self.enabled and not self.hud
+        self.hud_surface = None
+
+    def draw_hud(self, screen, font, position=(10, 10)):
+        """Draw the overlay on screen and return the area it covers, or None if it is hidden."""
+        if not self.hud:
+            return None
+        if self.hud_surface is None:
+            rows = [["ms", "p50", "p95", "p99"]]
+            for name in ["frame", "work"] + PHASES:
+                rows.append([name] + [f"{value:.2f}" for value in self.percentiles(name)])
+            widths = [max(font.size(row[column])[0] for row in rows) + 10 for column in range(4)]  # Columns line up with any font
+            height = font.get_linesize()
+            title = font.render(f"frames {self.frames}  over budget {self.dropped} ({self.dropped / max(self.frames, 1):.1%})", True, (255, 255, 255))
+            self.hud_surface = pygame.Surface((max(sum(widths), title.get_width()) + 8, height * (len(rows) + 1) + 8))
+            self.hud_surface.set_alpha(200)  # See the game through the overlay
+            self.hud_surface.blit(title, (4, 4))
+            for row_index, row in enumerate(rows, 1):
+                x = 4
+                for column, (cell, width) in enumerate(zip(row, widths)):
+                    text = font.render(cell, True, (255, 255, 255))
+                    # Names are left aligned, numbers right aligned
+                    self.hud_surface.blit(text, (x if column == 0 else x + width - text.get_width(), 4 + row_index * height))
+                    x += width
+        return screen.blit(self.hud_surface, position)
+
+    def stats(self):
+        """Return the frame counters and the p50/p95/p99 of every phase as a dictionary."""
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            **{name: [round(value, 3) for value in self.percentiles(name)] for name in ["frame", "work"] + PHASES},
+        }
+
+    def close(self):
+        """Flush and stop the log writer."""
+        if self.writer:
+            self.writer.close()
+
+class SampleWriter(threading.Thread):
+    """Write frame samples to a CSV or JSON lines file on a background thread so logging never stalls a frame."""
+
+    def __init__(self, path):
+        super().__init__(name="profile-writer", daemon=True)  # Don't keep the process alive when the game quits
+        self.path = path  # .csv for a spreadsheet, anything else for one JSON object per line
+        self.samples = queue.SimpleQueue()  # Samples waiting to be written, None to stop
+        self.start()
+
+    def put(self, sample):
+        """Queue a sample for writing."""
+        self.samples.put(sample)
+
+    def run(self):
+        csv = self.path.endswith(".csv")
+        with open(self.path, "w") as file:
+            if csv:
+                file.write(",".join(["frame", "frame_ms", "work_ms"] + [f"{name}_ms" for name in PHASES]) + "\n")
+            while (sample := self.samples.get()) is not None:
+                if csv:
+                    file.write(",".join(f"{value:.4f}" if isinstance(value, float) else str(value) for value in sample.values()) + "\n")
+                else:
+                    file.write(json.dumps(sample) + "\n")
+
+    def close(self):
+        """Write the remaining samples and wait for the file to be closed."""
+        self.samples.put(None)
+        self.join()
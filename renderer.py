@@ -0,0 +1,234 @@
+import pygame  # Import the pygame library
+from collections import OrderedDict  # Ordered dictionary used to track the least recently used frames
+
+class DirtyRenderer:
+    """Draw on a fixed-size screen and push only its changed regions to the window, scaled to fit any window size."""
+
+    def __init__(self, enabled=True, smooth=True, frame_cache_bytes=128 * 1024 * 1024):
+        self.screen = None  # Fixed-size surface everything is drawn on, set by attach()
+        self.screen_rect = None  # Area of the whole screen
+        self.window = None  # Display surface the screen is shown in (the screen itself when nothing is scaled)
+        self.viewport = None  # Area of the window the screen is scaled into, the rest are black bars
+        self.smooth = smooth  # Smooth scaling, or nearest pixel (cheaper on 4K windows)
+        self.frame_cache = OrderedDict()  # View -> (frame scaled to the window, its dirty regions), least recently used first
+        self.frame_cache_bytes = frame_cache_bytes  # Memory budget of the scaled frames, emptied when the window size changes
+        self.cached_bytes = 0  # Memory used by the scaled frames
+        self.enabled = enabled  # Whether dirty rectangles are used at all
+        self.dirty = []  # Regions changed during the current frame
+        self.previous = []  # Regions changed during the previous frame (need to be erased)
+        self.full_redraw = True  # Whether the whole screen has to be pushed this frame
+        self.view = None  # View of the frame being drawn, only set by begin_frame() (scenes without one are never cached)
+        self.last_view = None  # View drawn during the previous frame
+        self.pixels_pushed = 0  # Pixels pushed to the display during the last frame
+        self.total_pixels = 0  # Pixels pushed since startup
+        self.frames = 0  # Frames presented since startup
+        self.full_frames = 0  # Frames that needed a full flip
+        self.scaled_frames = 0  # Full frames scaled to the window in one go
+        self.cached_frames = 0  # Full frames taken from the frame cache instead
+
+    def attach(self, screen, window=None):
+        """Draw on screen from now on and show it in window (by default the screen is the window)."""
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.resize(window or screen)
+
+    def resize(self, window):
+        """Show the screen in a new or resized window, as large as fits without stretching it."""
+        self.window = window
+        width, height = window.get_size()
+        scale = min(width / self.screen_rect.width, height / self.screen_rect.height)
+        self.viewport = pygame.Rect(0, 0, round(self.screen_rect.width * scale), round(self.screen_rect.height * scale))
+        self.viewport.center = (width // 2, height // 2)
+        self.frame_cache.clear()  # Scaled for the old size
+        self.cached_bytes = 0
+        if window is not self.screen:
+            window.fill((0, 0, 0))  # Black bars around the screen
+        self.invalidate()
+
+    def begin_frame(self, view):
+        """Start a frame for the given view and return True if it has to be fully redrawn."""
+        if not self.enabled or view != self.last_view:
+            self.full_redraw = True  # Camera switches always repaint the whole screen
+        self.view = self.last_view = view
+        return self.full_redraw
+
+    def invalidate(self):
+        """Force the next present to push the whole screen (overlays, scene changes)."""
+        self.full_redraw = True
+
+    def mark(self, rect):
+        """Record a region that changed this frame."""
+        self.dirty.append(pygame.Rect(rect))
+
+    def present(self):
+        """Push the changed regions, or the whole screen, to the display."""
+        if self.full_redraw:
+            if self.window is not self.screen:
+                self.show_all()
+            pygame.display.flip()  # Push the whole screen
+            self.pixels_pushed = self.screen_rect.width * self.screen_rect.height
+            self.full_frames += 1
+        else:
+            rects = merge_rects([rect.clip(self.screen_rect) for rect in self.previous + self.dirty])  # Old and new positions of everything that moved
+            self.pixels_pushed = sum(rect.width * rect.height for rect in rects)
+            if self.window is not self.screen:
+                rects = [self.show(rect) for rect in self.scaled_regions(rects)]
+            pygame.display.update(rects)  # Push only the changed regions
+        self.total_pixels += self.pixels_pushed
+        self.frames += 1
+        self.previous = self.dirty
+        self.dirty = []
+        self.full_redraw = False
+        self.view = None
+
+    def show_all(self):
+        """Copy or scale the whole screen into the window, from the frame cache when this view was scaled before."""
+        if self.viewport.size == self.screen_rect.size:
+            self.window.blit(self.screen, self.viewport)
+            return
+        cached = self.frame_cache.get(self.view) if self.view is not None else None
+        if cached:
+            # Everything but the regions that change within a view is the same as when the frame was cached
+            frame, regions = cached
+            self.frame_cache.move_to_end(self.view)
+            self.window.blit(frame, self.viewport)
+            for rect in self.scaled_regions(regions + self.dirty):
+                self.show(rect)
+            self.cached_frames += 1
+            return
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        scale(self.screen, self.viewport.size, self.window.subsurface(self.viewport))
+        self.scaled_frames += 1
+        if self.view is not None:
+            self.cache_frame(self.view, self.window.subsurface(self.viewport).copy(), list(self.dirty))
+
+    def cache_frame(self, view, frame, regions):
+        """Keep a scaled frame for view, dropping the least recently used ones to stay within the budget."""
+        size = frame.get_pitch() * frame.get_height()
+        if size > self.frame_cache_bytes:
+            return  # A single frame is over budget: always scale
+        self.frame_cache[view] = (frame, regions)
+        self.cached_bytes += size
+        while self.cached_bytes > self.frame_cache_bytes:
+            _, (evicted, _) = self.frame_cache.popitem(last=False)
+            self.cached_bytes -= evicted.get_pitch() * evicted.get_height()
+
+    def scaled_regions(self, rects):
+        """Return the regions to scale for changed ones, widened so no window pixel keeps colours of a pixel that changed."""
+        if self.viewport.size == self.screen_rect.size:
+            return rects  # Copied 1:1, nothing spills over
+        # A scaled region is stretched by up to a pixel and smoothing blends in one more around it
+        return merge_rects([rect.inflate(4, 4).clip(self.screen_rect) for rect in rects])
+
+    def show(self, rect):
+        """Copy or scale a region of the screen into the window and return the area of the window it covers."""
+        target = self.to_window(rect)
+        if self.viewport.size == self.screen_rect.size:
+            self.window.blit(self.screen, target, rect)
+            return target
+        if not target.width or not target.height:
+            return target
+        # Scale a slightly larger region so smooth scaling blends with the neighbouring pixels, then keep the middle
+        outer = rect.inflate(4, 4).clip(self.screen_rect)
+        outer_target = self.to_window(outer)
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        scaled = scale(self.screen.subsurface(outer), outer_target.size)
+        self.window.blit(scaled, target, target.move(-outer_target.x, -outer_target.y))
+        return target
+
+    def to_window(self, rect):
+        """Return the area of the window a region of the screen is shown in."""
+        view, width, height = self.viewport, self.screen_rect.width, self.screen_rect.height
+        left, top = view.x + rect.left * view.width // width, view.y + rect.top * view.height // height
+        right, bottom = view.x + rect.right * view.width // width, view.y + rect.bottom * view.height // height
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def stats(self):
+        """Return the renderer counters as a dictionary."""
+        full_pixels = self.screen_rect.width * self.screen_rect.height
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "pixels_last_frame": self.pixels_pushed,
+            "pixels_per_frame": self.total_pixels / self.frames if self.frames else 0,
+            "saved": 1 - self.total_pixels / (self.frames * full_pixels) if self.frames else 0.0,
+            "window": self.window.get_size(),
+            "scaled_frames": self.scaled_frames,
+            "cached_frames": self.cached_frames,
+        }
+
+def merge_rects(rects):
+    """Merge overlapping rectangles so no pixel is pushed twice."""
+    merged = []
+    for rect in rects:
+        if not rect.width or not rect.height:
+            continue  # Skip empty regions (e.g. clipped off screen)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))  # Grow the rectangle to cover the overlapping one
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class DrawList:
+    """Blits collected over a frame and sent to the screen in one Surface.blits call, taking packed sprites from an atlas."""
+
+    def __init__(self, renderer, atlas=None, batch=True):
+        self.renderer = renderer  # Dirty-rectangle renderer whose screen is drawn on
+        self.atlas = atlas  # Sprite atlas sources are looked up in, or None
+        self.batch = batch  # One Surface.blits call per frame, or one Surface.blit per item like before
+        self.items = []  # (source, destination, area) in drawing order
+        self.marked = []  # Indexes of the items whose region changed this frame
+        self.frames = 0  # Frames flushed
+        self.blits = 0  # Items drawn since startup
+        self.calls = 0  # Surface.blit and Surface.blits calls made since startup
+
+    def add(self, source, destination, area=None, dirty=False):
+        """Queue a blit. Surfaces packed in the atlas are drawn from it. dirty marks the region as changed."""
+        if area is None and self.atlas:
+            source, area = self.atlas.lookup(source)
+        if dirty:
+            self.marked.append(len(self.items))
+        self.items.append((source, destination, area))
+
+    def extend(self, blits, dirty=False):
+        """Queue a sequence of (source, destination) pairs, e.g. from ObstacleStore.blit_sequence."""
+        start = len(self.items)
+        if self.atlas:
+            lookup = self.atlas.lookup
+            self.items += [(source, destination, area) for (source, area), destination in ((lookup(source), destination) for source, destination in blits)]
+        else:
+            self.items += [(source, destination, None) for source, destination in blits]
+        if dirty:
+            self.marked += range(start, len(self.items))
+
+    def restore(self, background):
+        """Queue erasing last frame's dirty regions by copying the background back over them."""
+        for rect in self.renderer.previous:
+            self.items.append((background, rect, rect))
+
+    def flush(self):
+        """Draw the queued blits in order and mark the dirty ones on the renderer."""
+        screen = self.renderer.screen
+        if self.batch:
+            rects = screen.blits(self.items)
+            self.calls += 1
+        else:
+            rects = [screen.blit(*item) for item in self.items]
+            self.calls += len(self.items)
+        for index in self.marked:
+            self.renderer.mark(rects[index])
+        self.blits += len(self.items)
+        self.frames += 1
+        self.items.clear()
+        self.marked.clear()
+
+    def stats(self):
+        """Return the draw counters as a dictionary."""
+        frames = self.frames or 1
+        return {
+            "frames": self.frames,
+            "blits_per_frame": self.blits / frames,
+            "calls_per_frame": self.calls / frames,
+            "calls_saved_per_frame": (self.blits - self.calls) / frames,  # Compared with one Surface.blit per item
+        }
@@ -0,0 +1,240 @@
+import argparse  # Import the argparse library
+import os  # Import the os library
+import struct  # Import the struct library
+import sys  # Import the sys library
+import tempfile  # Import the tempfile library
+import time  # Import the time library
+from settings import *  # Import all constants and libraries from settings.py
+from simulation import Autopilot, Simulation  # Import the game rules and the bot
+
+MAGIC = b"FNAFREC"  # First bytes of every recording
+VERSION = 2  # Bumped whenever the format or the way a seed plays out changes (2: obstacle schedule drawn up front)
+HEADER = struct.Struct("<7sBIH")  # Magic, version, seed and FPS the recording was made at
+KEYS = [pygame.K_SPACE, pygame.K_a, pygame.K_d, pygame.K_f, pygame.K_ESCAPE, pygame.K_r]  # Keys the game reacts to, by code
+RELEASED = 0x08  # Added to a key's code for a key release
+RETRY = 0x10  # R pressed on the game over screen
+END = 0x11  # Recording stopped, followed by the score
+
+class Recorder:
+    """Write the seed and every key event the game rules receive, stamped with its tick, to a small binary file."""
+
+    def __init__(self, path, seed):
+        self.file = open(path, "wb")  # Buffered, so recording a key press doesn't wait for the disk
+        self.path = path
+        self.last_tick = 0  # Tick of the previous record; each record stores the ticks since then
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, FPS))
+
+    def write(self, tick, code):
+        """Write one record: ticks since the previous record, then the code."""
+        self.file.write(encode_varint(tick - self.last_tick) + bytes([code]))
+        self.last_tick = tick
+
+    def record(self, tick, events):
+        """Record the (kind, key) events passed to the game rules at tick, keeping only the keys the game uses."""
+        for kind, key in events:
+            if key in KEYS and kind in (pygame.KEYDOWN, pygame.KEYUP):
+                self.write(tick, KEYS.index(key) | (RELEASED if kind == pygame.KEYUP else 0))
+
+    def retry(self, tick):
+        """Record a retry from the game over screen."""
+        self.write(tick, RETRY)
+
+    def close(self, tick, score):
+        """Mark the end of the recording with the final score, so a replay can check it ended the same way."""
+        self.write(tick, END)
+        self.file.write(encode_varint(score))
+        self.file.close()
+
+def encode_varint(value):
+    """Return value as a little-endian base-128 varint (one byte for values below 128)."""
+    data = bytearray()
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+def decode_varint(data, offset):
+    """Return the varint at offset in data and the offset after it."""
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class Recording:
+    """A recording read back from disk: the seed, the tick-stamped records and how it ended."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, self.seed, self.fps = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+        self.records = []  # (tick, code) in order
+        self.end_tick = None  # Tick the recording stopped at, None if the game crashed before closing it
+        self.score = None  # Score when the recording stopped
+        offset, tick = HEADER.size, 0
+        while offset < len(data):
+            delta, offset = decode_varint(data, offset)
+            tick += delta
+            code = data[offset]
+            offset += 1
+            if code == END:
+                self.end_tick = tick
+                self.score, offset = decode_varint(data, offset)
+                break
+            self.records.append((tick, code))
+
+    def last_tick(self):
+        """Return the tick to replay up to."""
+        if self.end_tick is not None:
+            return self.end_tick
+        return self.records[-1][0] + 1 if self.records else 0
+
+def apply_records(sim, records, index):
+    """Apply the records from index stamped with the current tick. Return the key events for the tick's step, the index after them and whether the player retried."""
+    tick = sim.clock.tick_count
+    events = []
+    retried = False
+    while index < len(records) and records[index][0] == tick:
+        code = records[index][1]
+        if code == RETRY:
+            sim.retry()
+            retried = True
+        else:
+            events.append((pygame.KEYUP if code & RELEASED else pygame.KEYDOWN, KEYS[code & ~RELEASED]))
+        index += 1
+    return events, index, retried
+
+def replay(recording, sim, draw=None, until=None):
+    """Feed a recording into sim as fast as possible and return how it ended. draw() is called after every tick if given."""
+    sim.new_night(recording.seed)
+    end = recording.last_tick() if until is None else min(until, recording.last_tick())
+    records = recording.records
+    index = 0
+    deaths = 0
+    outcome = None
+    while sim.clock.tick_count < end:
+        events, index, retried = apply_records(sim, records, index)
+        if retried:
+            outcome = None
+        if outcome:
+            break  # Jumpscared and never retried: the player quit on the game over screen
+        outcome = sim.step(events)
+        sim.clock.advance()
+        if draw:
+            draw()
+        if outcome == "win":
+            break
+        if outcome:
+            deaths += 1
+    if sim.clock.tick_count == end and outcome != "win":
+        # Records stamped with the end tick never got a step, e.g. R pressed on the game over screen and then the window closed
+        events, index, retried = apply_records(sim, records, index)
+        if retried:
+            outcome = None
+        for kind, key in events:
+            sim.handle_key(kind, key, sim.clock())
+    result = "win" if outcome == "win" else f"jumpscare:{outcome.name}" if outcome else "quit"
+    return {"seed": recording.seed, "result": result, "score": sim.score, "ticks": sim.clock.tick_count, "deaths": deaths, "time": sim.current_time_label}
+
+def record_night(path, seed, player, retries, quit_after_retry=False):
+    """Play a night and record it the way the game does, retrying after the first retries jumpscares. Return how it ended."""
+    sim = Simulation(seed=seed)
+    recorder = Recorder(path, seed)
+    deaths = 0
+    while True:
+        events = player(sim) if player else []
+        if events:
+            recorder.record(sim.clock.tick_count, events)
+        outcome = sim.step(events)
+        sim.clock.advance()
+        if outcome == "win":
+            break
+        if outcome:
+            deaths += 1
+            if deaths > retries:
+                break  # Quit on the game over screen
+            sim.retry()
+            recorder.retry(sim.clock.tick_count)
+            if deaths == retries and quit_after_retry:
+                outcome = None
+                break  # Pressed R, then closed the window before the next tick
+    recorder.close(sim.clock.tick_count, sim.score)
+    result = "win" if outcome == "win" else f"jumpscare:{outcome.name}" if outcome else "quit"
+    return {"seed": seed, "result": result, "score": sim.score, "ticks": sim.clock.tick_count, "deaths": deaths}
+
+CHECKS = {  # Name: (player, retries, quit right after the last retry)
+    "bot plays the night": (Autopilot, 0, False),
+    "jumpscare then quit": (None, 0, False),
+    "retry then play": (None, 2, False),
+    "retry then quit": (None, 1, True),
+}
+
+def check():
+    """Record nights in every way they can end, replay them and return 1 if a replay ends differently."""
+    failed = 0
+    with tempfile.TemporaryDirectory() as folder:
+        for name, (player, retries, quit_after_retry) in CHECKS.items():
+            path = os.path.join(folder, "night.fnafrec")
+            played = record_night(path, 7, player() if player else None, retries, quit_after_retry)
+            replayed = replay(Recording(path), Simulation())
+            replayed.pop("time")
+            same = replayed == played
+            failed += not same
+            print(f"{name:<22}{'ok' if same else 'DIVERGED'}  played {played}" + ("" if same else f", replayed {replayed}"))
+    return 1 if failed else 0
+
+def main(argv=None):
+    """Replay a recording and check that it ends the way it did when it was played."""
+    parser = argparse.ArgumentParser(description="Replay a recorded night as fast as possible.")
+    parser.add_argument("recording", nargs="?", help="file written by the game (see RECORD_INPUT in settings.py)")
+    parser.add_argument("--check", action="store_true", help="record and replay nights ending every way they can, exit with 1 if one diverges")
+    parser.add_argument("--render", action="store_true", help="draw every tick with the game's renderer")
+    parser.add_argument("--window", action="store_true", help="draw in a visible window instead of off-screen")
+    parser.add_argument("--profile", action="store_true", help="time every phase of every tick (implies --render)")
+    parser.add_argument("--until", type=int, help="stop at this tick")
+    args = parser.parse_args(argv)
+    if args.check:
+        return check()
+    if not args.recording:
+        parser.error("a recording is needed unless --check is given")
+
+    recording = Recording(args.recording)
+    if recording.fps != FPS:
+        print(f"Warning: recorded at {recording.fps} FPS, replaying at {FPS} FPS; the night will play out differently")
+    if args.render or args.profile:
+        if not args.window:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import FNAFFANGAME as fnaf  # Import the game itself to draw with it
+        fnaf.init()
+        sim = fnaf.game
+        if args.profile:
+            profiler.enabled = True
+            sim.profiler = profiler
+        def draw():
+            fnaf.draw_frame()
+            profiler.mark("draw")
+            renderer.present()
+            profiler.mark("present")
+            profiler.end_frame()
+    else:
+        sim, draw = Simulation(), None
+
+    start = time.perf_counter()
+    result = replay(recording, sim, draw, args.until)
+    elapsed = time.perf_counter() - start
+    print(f"{result} {result['ticks'] / elapsed:.0f} ticks/s")
+    if args.profile:
+        print(f"Frame profile (p50, p95, p99 ms): {profiler.stats()}")
+    if args.until is None and recording.score is not None and result["score"] != recording.score:
+        print(f"Replay diverged: the recording ended with score {recording.score}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
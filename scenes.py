@@ -0,0 +1,123 @@
+from settings import *  # Import all constants and libraries from settings.py
+
+class Scene:
+    """A screen of the game driven by the main loop: it gets the frame's events, updates and draws itself."""
+    static = False  # True when the scene looks the same every frame and the loop may sleep
+
+    def __init__(self):
+        self.start_time = pygame.time.get_ticks()  # Time the scene was entered
+        self.drawn = False  # Whether the current look of the scene is on the display
+
+    def elapsed(self):
+        """Return the milliseconds since the scene was entered."""
+        return pygame.time.get_ticks() - self.start_time
+
+    def update(self, events):
+        """Handle the frame's events and return the scene to show next (self to stay, None to quit)."""
+        for event in events:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.VIDEORESIZE):
+                self.drawn = False  # The window was uncovered or resized, draw again
+        return self
+
+    def draw(self):
+        """Draw the scene and push it to the display."""
+
+    def wake_in(self):
+        """Return how many milliseconds a static scene may sleep without events (0 = until the next event)."""
+        return 0
+
+class JumpscareScene(Scene):
+    """Play an enemy's jumpscare animation, hold the last frame, then move on to the next scene."""
+    FRAME_MS = 20  # Time each frame of the animation is shown
+    HOLD_MS = 3000  # Time the last frame stays on the screen
+
+    def __init__(self, player, sound_path, next_scene):
+        super().__init__()
+        self.player = player  # Jumpscare frame streamer, or None for a red screen
+        self.next_scene = next_scene  # Function returning the scene shown afterwards
+        self.frame_count = player.frame_count if player else 0
+        self.index = min(0, self.frame_count - 1)  # Frame currently on the screen (-1 for the red screen)
+        audio.play(sound_path, "jumpscare")  # Play the jumpscare sound effect
+
+    @property
+    def static(self):
+        return self.index >= self.frame_count - 1  # Only the last frame (or the red screen) is left
+
+    def update(self, events):
+        super().update(events)
+        elapsed = self.elapsed()
+        if elapsed >= self.frame_count * self.FRAME_MS + self.HOLD_MS:
+            if self.player:
+                if DEBUG_STATS:
+                    print(f"Jumpscare: {self.player.stats()}")  # Report frames decoded and peak memory
+                self.player.release()  # Free the decoded frames
+            return self.next_scene()
+        index = min(elapsed // self.FRAME_MS, self.frame_count - 1)
+        if index != self.index:
+            self.index = index
+            self.drawn = False
+        return self
+
+    def draw(self):
+        if self.drawn:
+            return
+        if self.player:
+            renderer.screen.blit(self.player.frame(self.index), (0, 0))  # Draw the frame, decoding the next ones ahead
+        else:
+            renderer.screen.fill(RED)  # No animation: fill the screen with red
+        renderer.invalidate()
+        renderer.present()
+        self.drawn = True
+
+    def wake_in(self):
+        return max(1, self.frame_count * self.FRAME_MS + self.HOLD_MS - self.elapsed())
+
+class WinScene(Scene):
+    """Show the win screen for a few seconds, then quit."""
+    static = True
+    SHOW_MS = 5000  # Time the win screen is shown
+
+    def __init__(self, image, sound_path):
+        super().__init__()
+        self.image = image  # Win screen image
+        audio.play(sound_path, "ui")  # Play the win sound
+
+    def update(self, events):
+        super().update(events)
+        return None if self.elapsed() >= self.SHOW_MS else self
+
+    def draw(self):
+        if not self.drawn:
+            renderer.screen.blit(self.image, (0, 0))
+            renderer.invalidate()
+            renderer.present()
+            self.drawn = True
+
+    def wake_in(self):
+        return max(1, self.SHOW_MS - self.elapsed())
+
+class GameOverScene(Scene):
+    """Show the game over screen until the player presses R to retry."""
+    static = True
+
+    def __init__(self, retry):
+        super().__init__()
+        self.retry = retry  # Function restarting the game and returning the scene to show
+        self.game_over_text = text_cache.render(get_font(100), "GAME OVER", True, RED)  # Render the game over text
+        self.retry_text = text_cache.render(get_font(50), "Press R to Retry", True, WHITE)  # Render the retry text
+
+    def update(self, events):
+        super().update(events)
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                return self.retry()  # Restart the game
+        return self
+
+    def draw(self):
+        if not self.drawn:
+            renderer.screen.fill(BLACK)  # Fill the screen with black color
+            renderer.screen.blit(self.game_over_text, self.game_over_text.get_rect(center=(gameover_x,gameover_y)))  # Draw the game over text
+            renderer.screen.blit(self.retry_text, self.retry_text.get_rect(center=(retry_x,retry_y)))  # Draw the retry text
+            renderer.invalidate()
+            renderer.present()
+            self.drawn = True
@@ -0,0 +1,60 @@
+import heapq  # Import the heapq library
+import math  # Import the math library
+
+class EnemyScheduler:
+    """Timer heap that wakes an animatronic only when its cooldown or its stay runs out, instead of checking every enemy every tick."""
+
+    def __init__(self, enemies):
+        self.enemies = enemies  # Animatronics in roster order; ties between wake-ups go to the earlier one
+        self.index = {enemy: index for index, enemy in enumerate(enemies)}  # Position of each enemy in the roster
+        self.heap = []  # (wake time, enemy index, generation) of every pending wake-up
+        self.generation = [0] * len(enemies)  # Bumped when an enemy is rescheduled, so its older wake-ups are skipped
+        self.active = {}  # Enemies on a camera, in the order they spawned (a dict used as an ordered set)
+
+    def reset(self):
+        """Schedule every enemy from scratch, after a restart or any change made to the enemies directly."""
+        self.heap.clear()
+        self.active.clear()
+        for enemy in self.enemies:
+            self.schedule(enemy)
+
+    def schedule(self, enemy):
+        """Work out when enemy next needs attention from its state, dropping any earlier wake-up of it."""
+        index = self.index[enemy]
+        self.generation[index] += 1
+        if enemy.active:
+            self.active.setdefault(enemy)
+        else:
+            self.active.pop(enemy, None)
+        wake = enemy.next_wake()
+        if wake != math.inf:  # Enemies kept away or already jumpscaring never wake
+            heapq.heappush(self.heap, (wake, index, self.generation[index]))
+
+    def wake(self, now):
+        """Spawn the enemies whose cooldown ran out and return the first one whose jumpscare is due, or None."""
+        heap = self.heap
+        due = []  # Indexes of enemies that stayed too long
+        while heap and heap[0][0] <= now:
+            _, index, generation = heapq.heappop(heap)
+            if generation != self.generation[index]:
+                continue  # Rescheduled (e.g. chased away by the flashlight) since this wake-up was set
+            enemy = self.enemies[index]
+            if enemy.active:
+                due.append(index)
+            else:
+                enemy.spawn(now)
+                self.schedule(enemy)  # Its jumpscare is the next thing to wait for
+        if not due:
+            return None
+        first = min(due)  # Same enemy as checking the roster in order
+        for index in due:
+            if index != first:
+                heapq.heappush(heap, (now, index, self.generation[index]))  # Left for the next tick, the night is over anyway
+        enemy = self.enemies[first]
+        enemy.jumpscare_played = True  # Mark the jumpscare as played
+        self.schedule(enemy)
+        return enemy
+
+    def on_camera(self, camera):
+        """Return the enemies on a camera, the one that has been there longest first."""
+        return [enemy for enemy in self.active if enemy.screen_name == camera]
@@ -1,9 +1,13 @@
+import json  # Import the json library
 import pygame  # Import the pygame library
 import random  # Import the random library
-
-# Initialize pygame and mixer
-pygame.init()
-pygame.mixer.init()
+import threading  # Import the threading library
+from assets import AssetCache  # Import the asset cache
+from assetpack import AssetPack  # Import the memory-mapped asset pack
+from renderer import DirtyRenderer  # Import the dirty-rectangle renderer
+from audio import AudioEngine  # Import the audio engine
+from textcache import TextCache  # Import the text rendering cache
+from profiler import FrameProfiler  # Import the frame profiler
 
 # Screen dimensions
 SCREEN_WIDTH = 800
@@ -24,55 +28,105 @@ BOX_HEIGHT = 300
 BOX_X = BOX_WIDTH // 2
 BOX_Y = BOX_HEIGHT // 2
 
-# Initialize the game screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("FNAF FAN GAME")
-
-# Load background image for "center" POV
-background_image = pygame.image.load("images/Background.jpg").convert()
-background_image = pygame.transform.scale(background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
+# Only push the changed parts of the center camera to the display
+DIRTY_RECTS = True
+# The game is always drawn at SCREEN_WIDTH x SCREEN_HEIGHT and scaled once, on the way to the window, to fit any window size
+WINDOW_SIZE = None  # Size of the window when it opens, e.g. (1920, 1080); None opens it at the game's own size
+FULLSCREEN = False  # Start fullscreen at the desktop resolution (toggled with FULLSCREEN_KEY)
+FULLSCREEN_KEY = pygame.K_F11  # Key switching between the window and fullscreen
+SMOOTH_SCALING = True  # Smooth the scaled picture; nearest pixel is about twice as fast on 4K screens
+SCALED_FRAME_CACHE_BYTES = 128 * 1024 * 1024  # Memory budget for camera views already scaled to the window (128 MB, five frames at 4K)
+renderer = DirtyRenderer(DIRTY_RECTS, SMOOTH_SCALING, SCALED_FRAME_CACHE_BYTES)  # Gets the game screen from init_display()
+SPRITE_ATLAS = True  # Pack the dinosaur frames, obstacles, sky and ground into a few large surfaces at startup (one per way of blitting them)
+BATCH_BLITS = True  # Send everything drawn in a frame to the screen in one Surface.blits call
+
+# Asset cache shared by every image load in the game
+ASSET_CACHE_BYTES = 32 * 1024 * 1024  # Memory budget for cached surfaces (32 MB)
+ASSET_WARM_UP = True  # Load the per-frame assets before the first frame
+PREFETCH_ASSETS_IN_BACKGROUND = True  # Load camera overlays, jumpscares and the win screen on a thread after the first frame
+DEBUG_STATS = False  # Print cache, renderer and text statistics when the game exits
+STARTUP_REPORT = False  # Print how long each startup phase took
+CHEAPEST_BLITS = True  # Load fully opaque images without alpha and images with only see-through and solid pixels as colorkey (much cheaper to draw)
+asset_cache = AssetCache(ASSET_CACHE_BYTES, CHEAPEST_BLITS)
+
+# Asset pack built by 'python build_assets.py': every image already scaled and converted, mapped instead of decoded
+ASSET_PACK_PATH = "assets.pack"
+USE_ASSET_PACK = True  # Images whose file changed since the pack was built are still loaded from the images folder
+
+# Jumpscare playback
+JUMPSCARE_EAGER = False  # Decode every jumpscare frame at startup (uses ~2 MB per frame) instead of streaming them
+JUMPSCARE_BUFFER_FRAMES = 4  # Number of decoded frames kept ahead of playback when streaming
+
+# Animatronics of the night, one entry per enemy in 'enemies.json': its name, the camera it watches, its camera and
+# flashlight images, its jumpscare sprite sheet (columns, rows, frames) and sound
+ENEMY_ROSTER_PATH = "enemies.json"
+CAMERAS = ["left", "right"]  # Side cameras an enemy can watch (A and D)
+
+def load_roster(path=ENEMY_ROSTER_PATH):
+    """Return the enemies listed in the roster file, checking that each one watches a known camera."""
+    with open(path) as file:
+        roster = json.load(file)
+    for entry in roster:
+        if entry["camera"] not in CAMERAS:
+            raise ValueError(f"{path}: {entry['name']} watches unknown camera {entry['camera']!r}, choose from {', '.join(CAMERAS)}")
+    return roster
+
+ENEMY_ROSTER = load_roster()
+JUMPSCARE_SHEETS = {entry["jumpscare"]: tuple(entry["sheet"]) for entry in ENEMY_ROSTER}  # Columns, rows and number of frames of each jumpscare sprite sheet
+NO_ENEMY_FLASHLIGHT_IMAGE = ("images/noneflashlight.png", (SCREEN_WIDTH, SCREEN_HEIGHT), True)  # Flashlight on an empty camera
+
+# Background image for "center" POV: (path, size, alpha) as passed to asset_cache.load
+BACKGROUND_IMAGE = ("images/Background.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT), False)
 
 # Clock for controlling the frame rate
 clock = pygame.time.Clock()
 FPS = 60
+MAX_CATCH_UP_TICKS = 5  # Most game ticks simulated in one frame when the frame rate drops
+SLEEP_WHEN_STATIC = True  # Sleep until the next event on screens that don't change (game over, win)
+
+# Frame profiler: times every phase of the main loop when PROFILE is on
+PROFILE = False  # Time the phases of each frame (events, game rules, drawing, display) and count frames over budget
+PROFILE_WINDOW = 600  # Frames the rolling percentiles are computed over (10 seconds at 60 FPS)
+PROFILE_LOG = None  # File every frame's times are written to, e.g. "profile.csv" or "profile.jsonl"
+PROFILE_HUD_KEY = pygame.K_F3  # Key showing or hiding the profiler overlay
+profiler = FrameProfiler(FPS, PROFILE_WINDOW, PROFILE, PROFILE_LOG)
+
+# Input recording: every night's seed and key presses are saved so it can be replayed with 'python replay.py'
+RECORD_INPUT = True
+RECORD_DIR = "recordings"  # Folder the recordings are written to
 
 # Game variables
 DINOSAUR_WIDTH, DINOSAUR_HEIGHT = 40, 60  # Dimensions of the dinosaur
 dinosaur_x, dinosaur_y = 300, 290 # Initial position of the dinosaur
-dino = pygame.Rect(dinosaur_x, dinosaur_y, DINOSAUR_WIDTH, DINOSAUR_HEIGHT)
 
 # Obstacle settings
 OBSTACLE_WIDTH = 20
-OBSCTALE_SPAWN_X= 500 # Initial x position of the obstacle to make sure it's far enough before adding another one
-obstacles = []  # List to store obstacles
-SPAWN_OBSTACLE_EVENT = pygame.USEREVENT + 1  # Custom event for spawning obstacles
-pygame.time.set_timer(SPAWN_OBSTACLE_EVENT, random.randint(1500, 2500))  # Set timer for obstacle spawning
+OBSTACLE_MIN_HEIGHT, OBSTACLE_MAX_HEIGHT = 20, 60  # Range of random obstacle heights
+OBSTACLE_SPAWN_X = 580  # Obstacles appear at the right edge of the box
+OBSTACLE_POOL_SIZE = 16  # Obstacle slots allocated once and reused for every spawn (grows, and counts it, if ever full)
+FADE_RAMP_STEP = 10  # Obstacles fade through images baked at startup every 10 alpha levels (fading in moves 10 per tick)
 
 # Jumping mechanics
-jumping = False
 jump_velocity = -15  # Initial jump velocity
 gravity = 1  # Gravity affecting the dinosaur
-velocity_y = 0  # Vertical velocity of the dinosaur
 
 # Game state variables
-score = 0  # Player's score
-flashlight = False  # Flashlight state
 flashlightkeyduration = 2000  # Duration for holding the flashlight key
-dino_game_active = True  # State of the dinosaur game
-dino_paused = False  # Pause state of the game
-current_pov = "center"  # Current point of view (camera)
-last_pov_change = pygame.time.get_ticks()  # Time of the last POV change
+
+# Difficulty ('python sweep.py' tries other values without changing these)
+ENEMY_COOLDOWN = (10000, 20000)  # Range of the time an enemy waits before it can spawn, in milliseconds
+ENEMY_SPAWN_DURATION = 10000  # Time an enemy stays before its jumpscare
+OBSTACLE_SPAWN_INTERVAL = (1500, 2500)  # Range of the time between two obstacles
+WIN_SCORE = 143  # Score that wins the night before 6 AM
 
 # Draw sky
-sky_image = pygame.image.load("images/sky.png").convert_alpha()  # Load the sky image
 sky_x, sky_y = 400, 240  # Position of the sky image
-sky_image = pygame.transform.scale(sky_image, (sky_x, sky_y))  # Adjust height to fit between ground and top of box
+SKY_IMAGE = ("images/sky.png", (sky_x, sky_y), True)  # Adjust height to fit between ground and top of box
 
 # Draw ground
-ground_image = pygame.image.load("images/ground.png").convert_alpha()  # Load the ground image
 groundimg_height, groundimg_width = 400, 60  # Position of the ground image
 ground_x,ground_y= 200, 330  # Position of the ground image
-ground_image = pygame.transform.scale(ground_image, (groundimg_height,groundimg_width))  # Scale the ground image to fit the box width and dinosaur height
+GROUND_IMAGE = ("images/ground.png", (groundimg_height,groundimg_width), True)  # Scale the ground image to fit the box width and dinosaur height
 
 #Text settings
 gameover_x, gameover_y = 400, 200  # Position of the game over image
@@ -82,22 +136,27 @@ resume_x, resume_y= 260, 300 # Position of the resume image
 gameborder_x, gameborder_y, gamerborder_height, gameborder_width= 195, 145, 410, 310  # Position and dimensions of the game border
 
 # Timer variables
-game_start_time = pygame.time.get_ticks()  # Start time of the game
 minutesinmil= 60000 # 1 Minute in milliseconds
-current_time_label = "12:00 AM"  # Initial time label
 
 # Font settings
-font = pygame.font.Font("font/Minecraft.ttf", 24)  # Font for rendering text
-
-# Initialize key_held_start
-key_held_start = 0 # Start time for tracking key press duration
+FONT_PATH = "font/Minecraft.ttf"  # Font used for all text
+FONT_SIZE = 24  # Size of the in-game text
+TEXT_CACHE_ENTRIES = 256  # Most rendered texts kept in the text cache
+text_cache = TextCache(TEXT_CACHE_ENTRIES)  # Cache of rendered labels (score, timer, menus)
 
 # Base speed for obstacles
 base_obstacle_speed = 5 
 
-# Load win screen image
-win_image = pygame.image.load("images/winscreen.jpg").convert()
-winsound= pygame.mixer.Sound("sound/winsound.wav")
+# Win screen image and sound
+WIN_IMAGE = ("images/winscreen.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT), False)
+WIN_SOUND = "sound/winsound.wav"
+
+# Audio: every category gets its own channels, so a jumpscare never cuts off the win sound or the other way round
+AUDIO_CHANNELS = {"jumpscare": 2, "ui": 2}  # Channels reserved for each category; a third jumpscare cuts off the oldest one
+STREAMED_SOUNDS = [WIN_SOUND]  # Long clips played once, streamed from disk instead of decoded into memory
+AUDIO_FREQUENCY = 44100  # Mixer sample rate
+AUDIO_BUFFER = 512  # Mixer buffer in samples (512 = an estimated 12 ms at most from trigger to sound)
+audio = AudioEngine(AUDIO_CHANNELS, STREAMED_SOUNDS, AUDIO_FREQUENCY, AUDIO_BUFFER)  # Opens the mixer the first time a sound is loaded or played
 
 # Dinosaur Animation State
 current_frame_index = 0  # Current frame index for running animation
@@ -106,3 +165,50 @@ animation_timer = 0  # Timer for animation
 
 # Load Dino Sprite Sheet
 sprite_sheet_path = "images/purpguy.png"  # Path to the sprite sheet
+DINO_SHEET_GRID = (5, 7)  # Columns and rows in the sprite sheet
+DINO_RUN_FRAMES = [0, 1, 2, 3, 4]  # Frames for running (top row)
+DINO_JUMP_FRAME = 30  # Frame for jumping (bottom-left frame)
+
+# Assets the first frame of the center camera needs, loaded by the warm-up pass at startup
+OBSTACLE_IMAGES = [("images/obstacle.png", (OBSTACLE_WIDTH, height), True) for height in range(OBSTACLE_MIN_HEIGHT, OBSTACLE_MAX_HEIGHT + 1)]
+WARM_UP_ASSETS = [BACKGROUND_IMAGE, SKY_IMAGE, GROUND_IMAGE] + OBSTACLE_IMAGES
+
+# Sprites packed into the sprite atlas at startup (with the dinosaur frames; the obstacle fade ramps draw faster from their own surfaces)
+ATLAS_SPRITES = [SKY_IMAGE, GROUND_IMAGE] + OBSTACLE_IMAGES
+
+# Assets only needed once the player switches camera or the night ends, prefetched after the first frame
+PREFETCH_ASSETS = [
+    (entry[image], (SCREEN_WIDTH, SCREEN_HEIGHT), True) for entry in ENEMY_ROSTER for image in ("indicator", "flashlight")  # Camera and flashlight images of each enemy
+] + [NO_ENEMY_FLASHLIGHT_IMAGE, WIN_IMAGE]
+
+def init_display():
+    """Open the game window. Nothing is initialized when settings is imported, so tools can run without a window."""
+    pygame.display.init()  # Only the display: fonts and sound start the first time they are used
+    window = open_window(FULLSCREEN)
+    pygame.display.set_caption("FNAF FAN GAME")
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()  # The game draws here, the renderer scales it into the window
+    renderer.attach(screen, window)
+    return screen
+
+def open_window(fullscreen):
+    """Open (or reopen) the window fullscreen at the desktop resolution, or resizable at WINDOW_SIZE."""
+    if fullscreen:
+        return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    return pygame.display.set_mode(WINDOW_SIZE or (SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+
+def open_asset_pack():
+    """Let the asset cache read images from the asset pack, if one was built. Needs the display to be open."""
+    if USE_ASSET_PACK and asset_cache.pack is None:
+        asset_cache.pack = AssetPack.open(ASSET_PACK_PATH)
+    return asset_cache.pack
+
+fonts = {}  # Loaded fonts by size
+
+def get_font(size=FONT_SIZE):
+    """Return the game font at the given size, starting the font module the first time."""
+    font = fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = fonts[size] = pygame.font.Font(FONT_PATH, size)
+    return font
@@ -0,0 +1,402 @@
+import math  # Import the math library
+import operator  # Import the operator library
+import sys  # Import the sys library
+import time  # Import the time library
+
+from settings import *  # Import all constants and libraries from settings.py
+from obstacles import ObstacleSpawner, ObstacleStore  # Import the array-backed obstacle store and its spawn schedule
+from scheduler import EnemyScheduler  # Import the enemy wake-up scheduler
+
+TICK_MS = 1000 / FPS  # Length of one simulation tick in milliseconds
+NIGHT_TICKS = int(12 * minutesinmil / TICK_MS)  # Ticks in a full 12 minute night
+
+# Difficulty of a night; Simulation(rules={...}) overrides any of them
+RULES = {
+    "enemy_cooldown": ENEMY_COOLDOWN,  # (min, max) milliseconds before an enemy can spawn
+    "spawn_duration": ENEMY_SPAWN_DURATION,  # Milliseconds an enemy stays before its jumpscare
+    "flashlight_duration": flashlightkeyduration,  # Milliseconds the flashlight must be held on an enemy
+    "obstacle_speed": base_obstacle_speed,  # Pixels per tick the obstacles move at the start
+    "spawn_interval": OBSTACLE_SPAWN_INTERVAL,  # (min, max) milliseconds between obstacles
+    "win_score": WIN_SCORE,  # Score that wins the night
+}
+
+class TickClock:
+    """Game clock that advances by a fixed step per tick instead of reading the wall clock."""
+
+    def __init__(self, tick_ms=TICK_MS):
+        self.tick_ms = tick_ms  # Milliseconds per tick
+        self.tick_count = 0  # Number of ticks simulated so far
+
+    def advance(self):
+        """Move the clock forward by one tick."""
+        self.tick_count += 1
+
+    def reset(self):
+        """Go back to the start of the night."""
+        self.tick_count = 0
+
+    def __call__(self):
+        """Return the current game time in milliseconds, like pygame.time.get_ticks()."""
+        return int(self.tick_count * self.tick_ms)
+
+class Animatronic:
+    """Spawn and jumpscare timing of an animatronic, driven by the simulation clock."""
+
+    __slots__ = ("screen_name", "name", "active", "cooldown", "last_spawn_time", "spawn_time", "spawn_duration", "jumpscare_played")
+
+    def __init__(self, screen_name, rng=random, name=None):
+        self.screen_name = screen_name  # Screen name where the enemy appears
+        self.name = name or screen_name  # Name shown in results, e.g. "BB"
+        self.active = False  # Whether the enemy is active
+        self.cooldown = rng.randint(*ENEMY_COOLDOWN)  # Cooldown time before the enemy can spawn again
+        self.last_spawn_time = 0  # Last time the enemy was spawned
+        self.spawn_time = 0  # Time when the enemy was spawned
+        self.spawn_duration = ENEMY_SPAWN_DURATION  # Duration the enemy stays active
+        self.jumpscare_played = False  # Track if jumpscare has been played
+
+    def spawn(self, now):
+        """Spawn the enemy once its cooldown has passed."""
+        if not self.active and now - self.last_spawn_time > self.cooldown:
+            self.active = True  # Activate the enemy
+            self.spawn_time = now  # Record the spawn time
+
+    def despawn(self, now):
+        """Despawn the enemy."""
+        self.active = False  # Deactivate the enemy
+        self.last_spawn_time = now  # Record the last spawn time
+
+    def next_wake(self):
+        """Return the first game time (in whole milliseconds) the enemy spawns or stays too long, or inf if nothing is coming."""
+        if self.active:
+            if self.jumpscare_played:
+                return math.inf
+            deadline = self.spawn_time + self.spawn_duration  # Jumpscare once it has stayed longer than spawn_duration
+        else:
+            deadline = self.last_spawn_time + self.cooldown  # Spawn once the cooldown has passed
+        return math.floor(deadline) + 1 if deadline != math.inf else math.inf
+
+class GameState:
+    """What a night changes while it is played. Restarting swaps in a fresh one instead of resetting each field."""
+
+    __slots__ = ("dino_game_active", "dino_paused", "score", "jumping", "velocity_y", "current_pov", "game_start_time", "hours", "current_time_label")
+
+    def __init__(self, now=0):
+        self.dino_game_active = True  # State of the dinosaur game
+        self.dino_paused = False  # Pause state of the game
+        self.score = 0  # Player's score
+        self.jumping = False  # Whether the dinosaur is in the air
+        self.velocity_y = 0  # Vertical velocity of the dinosaur
+        self.current_pov = "center"  # Current point of view (camera)
+        self.game_start_time = now  # Start time of the night
+        self.hours = 12
+        self.current_time_label = "12:00 AM"
+
+def state_attribute(name):
+    """Return a property reading and writing name on the simulation's current GameState."""
+    return property(operator.attrgetter(f"state.{name}"), lambda sim, value: setattr(sim.state, name, value))
+
+class Simulation:
+    """Game rules of one night, advanced one tick at a time with no window or rendering."""
+
+    # The night's state lives in self.state; these read and write it as if it were the simulation's own
+    dino_game_active = state_attribute("dino_game_active")
+    dino_paused = state_attribute("dino_paused")
+    score = state_attribute("score")
+    jumping = state_attribute("jumping")
+    velocity_y = state_attribute("velocity_y")
+    current_pov = state_attribute("current_pov")
+    game_start_time = state_attribute("game_start_time")
+    hours = state_attribute("hours")
+    current_time_label = state_attribute("current_time_label")
+
+    def __init__(self, enemies=None, clock=None, seed=None, profiler=None, rules=None):
+        unknown = set(rules or ()) - set(RULES)
+        if unknown:
+            raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+        rules = {**RULES, **(rules or {})}
+        self.enemy_cooldown = rules["enemy_cooldown"]  # Difficulty of the night, see RULES
+        self.spawn_duration = rules["spawn_duration"]
+        self.flashlight_duration = rules["flashlight_duration"]
+        self.obstacle_speed = rules["obstacle_speed"]
+        self.spawn_interval_range = rules["spawn_interval"]
+        self.win_score = rules["win_score"]
+        self.rng = random.Random()  # Random generator for obstacle heights, spawn times and enemy cooldowns
+        self.seed = None  # Seed of the current night, set by new_night()
+        self.profiler = profiler  # Frame profiler timing the phases of step(), or None
+        self.clock = clock or TickClock()  # Clock the game time is read from
+        if enemies is None:
+            enemies = [Animatronic(entry["camera"], self.rng, entry["name"]) for entry in ENEMY_ROSTER]
+        self.enemies = enemies  # Animatronics watching the cameras
+        self.scheduler = EnemyScheduler(enemies)  # Wakes each enemy only when its cooldown or stay runs out
+        self.dino = pygame.Rect(dinosaur_x, dinosaur_y, DINOSAUR_WIDTH, DINOSAUR_HEIGHT)  # Dinosaur hitbox
+        self.obstacles = ObstacleStore(OBSTACLE_POOL_SIZE)  # Obstacles in the dinosaur game, in slots reused for every spawn
+        self.spawner = ObstacleSpawner(self.obstacles, OBSTACLE_SPAWN_X, 350, OBSTACLE_WIDTH)  # When and how tall the next obstacle is
+        self.held = set()  # Keys currently held down
+        self.flashlight = False  # Flashlight state
+        self.key_held_start = 0  # Start time for tracking the flashlight key press duration
+        self.last_pov_change = 0  # Time of the last POV change
+        self.state = GameState()  # Score, dinosaur and camera of the night, replaced on every restart
+        self.new_night(seed)
+
+    def new_night(self, seed=None):
+        """Start a night from tick 0. The same seed and the same inputs always play out the same way."""
+        self.seed = random.randrange(2 ** 32) if seed is None else seed  # Kept so the night can be recorded and replayed
+        self.rng.seed(self.seed)
+        self.clock.reset()
+        for enemy in self.enemies:
+            enemy.cooldown = self.rng.randint(*self.enemy_cooldown)  # Cooldown time before the enemy can spawn again
+            enemy.spawn_duration = self.spawn_duration
+        self.held.clear()
+        self.flashlight = False
+        self.key_held_start = 0
+        self.last_pov_change = 0
+        # Every gap and height of the night, enough for back-to-back obstacles from 12 AM to 6 AM
+        count = math.ceil(12 * minutesinmil / max(self.spawn_interval_range[0], 1)) + 1
+        self.spawner.plan(self.rng, count, self.spawn_interval_range, (OBSTACLE_MIN_HEIGHT, OBSTACLE_MAX_HEIGHT))
+        self.restart()
+        return self.seed
+
+    def restart(self):
+        """Reset the game variables."""
+        now = self.clock()
+        self.state = GameState(now)  # Fresh score, dinosaur and camera in one swap
+        self.obstacles.clear()  # Remove every obstacle (the pool slots are kept)
+        self.spawner.disarm()  # The next gap starts from now
+        self.dino.y = dinosaur_y
+        for enemy in self.enemies:
+            enemy.despawn(now)
+            enemy.jumpscare_played = False
+        self.scheduler.reset()
+
+    def retry(self):
+        """Start again after a jumpscare, like pressing R on the game over screen."""
+        self.restart()
+        self.held.clear()  # Keys released during the jumpscare and game over screens never reached the game
+        self.flashlight = False
+
+    def step(self, events=()):
+        """Advance the game by one tick and return "win", the enemy that jumpscared the player, or None."""
+        profiler = self.profiler  # Only set when the game is being profiled
+        state = self.state
+        now = self.clock()
+        won = self.update_timer(now) or self.wingamecondition()
+        if profiler:
+            profiler.mark("timer")
+        if won:
+            return "win"  # Game won by surviving until 6 AM or reaching the winning score
+
+        if state.current_pov == "center" and state.dino_game_active and not state.dino_paused:
+            self.update_dino()
+        if profiler:
+            profiler.mark("obstacles")
+
+        # Spawn and handle the enemies whose timers ran out
+        scared = self.scheduler.wake(now)
+        if scared:
+            return scared  # The enemy stayed too long: jumpscare and game over
+        if profiler:
+            profiler.mark("enemies")
+
+        # The next obstacle comes 1.5 to 2.5 seconds after the track is clear
+        self.spawner.update(now, state.dino_game_active and not state.dino_paused)
+        if profiler:
+            profiler.mark("obstacles")
+
+        for kind, key in events:
+            self.handle_key(kind, key, now)
+
+        if self.flashlight and state.current_pov == "center":
+            self.flashlight = False  # Disable flashlight in center POV
+
+        self.handle_held_keys(now)
+        if profiler:
+            profiler.mark("input")
+        return None
+
+    def update_dino(self):
+        """Move the dinosaur and the obstacles and handle scoring and collisions."""
+        state = self.state
+        # Update dinosaur position if jumping
+        if state.jumping:
+            self.dino.y += state.velocity_y  # Update vertical position
+            state.velocity_y += gravity  # Apply gravity
+            if self.dino.y >= dinosaur_y:
+                self.dino.y = dinosaur_y  # Reset position if on the ground
+                state.jumping = False  # Stop jumping
+
+        # Move and fade every obstacle; the ones that faded out near the left edge of the box score a point
+        obstacle_speed = self.obstacle_speed + state.score // 1000  # Increase obstacle speed based on score
+        culled, hit = self.obstacles.advance(obstacle_speed, BOX_X + 30, self.dino)  # Also checks collision with all obstacles at once
+        state.score += culled
+        if hit != -1:
+            state.score = max(state.score - 10, 0)  # Decrease score by 10 for collision, never below 0
+            self.obstacles.remove(hit)  # Remove the obstacle
+            self.dino.x = dinosaur_x
+            self.dino.y = dinosaur_y  # Reset dinosaur's vertical position
+
+    def handle_key(self, kind, key, now):
+        """Apply a key press or release."""
+        state = self.state
+        if kind == pygame.KEYDOWN:
+            self.held.add(key)
+            if key == pygame.K_r:
+                if not state.dino_game_active:
+                    self.restart()
+                elif state.dino_paused:
+                    state.dino_paused = False
+            if key == pygame.K_ESCAPE and state.current_pov == "center":
+                state.dino_paused = not state.dino_paused
+            if key == pygame.K_f:
+                self.key_held_start = now  # Start tracking key press time
+                self.flashlight = True
+        elif kind == pygame.KEYUP:
+            self.held.discard(key)
+            if key == pygame.K_f:
+                self.key_held_start = 0  # Reset when key is released
+                self.flashlight = False
+
+    def handle_held_keys(self, now):
+        """Apply the keys that act while held: jump, camera switches and the flashlight."""
+        state, held = self.state, self.held
+        if pygame.K_SPACE in held and not state.jumping and state.dino_game_active and not state.dino_paused:
+            state.jumping = True
+            state.velocity_y = jump_velocity
+        if pygame.K_a in held and now - self.last_pov_change > 500:
+            state.current_pov = "left" if state.current_pov == "center" else "center"
+            self.last_pov_change = now
+        if pygame.K_d in held and now - self.last_pov_change > 500:
+            state.current_pov = "right" if state.current_pov == "center" else "center"
+            self.last_pov_change = now
+        if pygame.K_f in held:
+            if self.key_held_start and now - self.key_held_start > self.flashlight_duration:
+                watching = self.scheduler.on_camera(state.current_pov)
+                if watching:
+                    watching[0].despawn(now)  # Chase away the enemy that has been there longest
+                    self.scheduler.schedule(watching[0])
+                self.key_held_start = now  # Reset the timer to allow continuous despawning
+
+    def update_timer(self, now):
+        """Update the clock label and return True once 12 minutes have passed."""
+        state = self.state
+        elapsed_time = now - state.game_start_time  # Calculate elapsed time since game start
+        total_minutes = elapsed_time // minutesinmil  # Convert elapsed time to minutes
+        if total_minutes >= 12:
+            return True  # End the game if 12 minutes have passed
+
+        hours = 12 + total_minutes // 2  # Calculate the current hour
+        minutes = (total_minutes % 2) * 30  # Calculate the current minutes (0 or 30)
+        if hours > 12:
+            hours -= 12  # Adjust hours to 12-hour format
+        state.hours = hours
+        state.current_time_label = f"{hours}:{minutes:02d} AM"  # Format the current time label
+        return False  # Continue the game
+
+    def wingamecondition(self):
+        """Return True once the score reaches the winning score (143)."""
+        return self.state.score >= self.win_score
+
+class Autopilot:
+    """Simple bot that jumps over obstacles and flashes any animatronic that shows up."""
+
+    def __init__(self, reaction_ms=0):
+        self.target = None  # Enemy the bot is currently dealing with
+        self.reaction_ms = reaction_ms  # Time an enemy has been on a camera before the bot notices it
+
+    def __call__(self, sim):
+        """Return the key events the bot presses and releases this tick."""
+        wanted = set()  # Keys the bot wants held after this tick
+        if self.target and not self.target.active:
+            self.target = None  # Enemy gone, go back to the dinosaur game
+        if self.target is None:
+            now = sim.clock()
+            self.target = next((enemy for enemy in sim.scheduler.active if now - enemy.spawn_time >= self.reaction_ms), None)
+
+        if self.target is None:
+            if sim.current_pov != "center":
+                wanted.add(pygame.K_a if sim.current_pov == "left" else pygame.K_d)  # Switch back to the center camera
+            elif sim.obstacles.any_between(sim.dino.right, sim.dino.right + 40):
+                wanted.add(pygame.K_SPACE)  # Jump over the obstacle in front of the dinosaur
+        elif sim.current_pov == self.target.screen_name:
+            wanted.add(pygame.K_f)  # Hold the flashlight on the enemy
+        elif sim.current_pov == "center":
+            wanted.add(pygame.K_a if self.target.screen_name == "left" else pygame.K_d)  # Switch to the enemy's camera
+        else:
+            wanted.add(pygame.K_a if sim.current_pov == "left" else pygame.K_d)  # Wrong camera, go back to the center first
+
+        events = [(pygame.KEYUP, key) for key in sim.held - wanted]
+        events += [(pygame.KEYDOWN, key) for key in wanted - sim.held]
+        return events
+
+class NightBatch:
+    """Many nights simulated side by side, each stepped one tick per round until it ends."""
+
+    def __init__(self, seeds, players=None, max_ticks=NIGHT_TICKS + FPS, rules=None):
+        self.seeds = list(seeds)  # Seed of each night
+        self.sims = [Simulation(seed=seed, rules=rules) for seed in self.seeds]  # One simulation per night
+        self.players = list(players) if players is not None else [None] * len(self.sims)  # Bot playing each night, or None
+        self.max_ticks = max_ticks  # Nights still going after this many ticks time out
+        self.results = [None] * len(self.sims)  # Result of each night, in seed order, once it has ended
+
+    def step(self, running):
+        """Advance every running night by one tick and return the ones still running."""
+        still_running = []
+        max_ticks = self.max_ticks
+        for index, sim, player in running:
+            outcome = sim.step(player(sim) if player else ())
+            sim.clock.advance()
+            if outcome is None and sim.clock.tick_count < max_ticks:
+                still_running.append((index, sim, player))
+            else:
+                self.results[index] = night_result(sim, outcome)
+        return still_running
+
+    def run(self):
+        """Play every night to the end and return their results in seed order."""
+        running = list(zip(range(len(self.sims)), self.sims, self.players))
+        while running:
+            running = self.step(running)
+        return self.results
+
+def night_result(sim, outcome):
+    """Return how a night ended, given the last outcome of Simulation.step()."""
+    if outcome is None:
+        result = "timeout"
+    elif outcome == "win":
+        result = "win"
+    else:
+        result = f"jumpscare:{outcome.name}"
+    return {"seed": sim.seed, "result": result, "score": sim.score, "ticks": sim.clock.tick_count, "time": sim.current_time_label}
+
+def run_night(seed=None, player=None, max_ticks=NIGHT_TICKS + FPS, rules=None):
+    """Simulate one night headless and return how it ended (a night reaching 6 AM ends by itself before max_ticks)."""
+    return NightBatch([seed], [player], max_ticks, rules).run()[0]
+
+def main(argv=None):
+    """Run nights headless from the command line and report the simulation speed."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Run FNAF FAN GAME nights without a window.")
+    parser.add_argument("--nights", type=int, default=1, help="number of nights to simulate")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first night")
+    parser.add_argument("--idle", action="store_true", help="don't play, just let the night run")
+    parser.add_argument("--batch", action="store_true", help="simulate all the nights side by side and report the total speed")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        seeds = range(args.seed, args.seed + args.nights)
+        batch = NightBatch(seeds, [None if args.idle else Autopilot() for _ in seeds])
+        start = time.perf_counter()
+        results = batch.run()
+        elapsed = time.perf_counter() - start
+        for result in results:
+            print(result)
+        print(f"{args.nights} nights, {sum(result['ticks'] for result in results) / elapsed:.0f} ticks/s")
+        return
+
+    for night in range(args.nights):
+        start = time.perf_counter()
+        result = run_night(args.seed + night, None if args.idle else Autopilot())
+        elapsed = time.perf_counter() - start
+        print(f"{result} {result['ticks'] / elapsed:.0f} ticks/s")
+
+if __name__ == "__main__":
+    sys.exit(main())
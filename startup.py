@@ -0,0 +1,53 @@
+import threading  # Import the threading library
+import time  # Import the time library
+from contextlib import contextmanager  # Import the context manager decorator
+
+class StartupTimer:
+    """Record how long each startup phase takes, from the first import to the first frame and beyond."""
+
+    def __init__(self):
+        self.start = time.perf_counter()  # Time the game started importing
+        self.last = self.start  # End of the previous phase
+        self.phases = []  # (name, seconds) of each finished phase
+        self.lock = threading.Lock()  # Background phases finish on the prefetch thread
+
+    def mark(self, name):
+        """End the phase called name now (it started where the previous phase ended)."""
+        now = time.perf_counter()
+        with self.lock:
+            self.phases.append((name, now - self.last))
+            self.last = now
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with block as its own phase."""
+        start = time.perf_counter()
+        yield
+        with self.lock:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self):
+        """Return the phase timings as printable lines."""
+        with self.lock:
+            lines = [f"{name:<44}{seconds * 1000:>9.1f} ms" for name, seconds in self.phases]
+        lines.append(f"{'since start':<44}{(time.perf_counter() - self.start) * 1000:>9.1f} ms")
+        return "\n".join(lines)
+
+class Prefetcher(threading.Thread):
+    """Run loading jobs on a background thread so the game can draw its first frame without waiting for them."""
+
+    def __init__(self, jobs, timer=None):
+        super().__init__(name="prefetch", daemon=True)  # Don't keep the process alive when the game quits
+        self.jobs = jobs  # List of (name, function) to run in order
+        self.timer = timer  # Startup timer the job durations are recorded in
+
+    def run(self):
+        for name, job in self.jobs:
+            try:
+                if self.timer:
+                    with self.timer.phase(f"prefetch {name}"):
+                        job()
+                else:
+                    job()
+            except Exception as e:  # A failed prefetch only means the asset is loaded when it is first needed
+                print(f"Error prefetching {name}: {e}")
@@ -0,0 +1,145 @@
+import argparse  # Import the argparse library
+import itertools  # Import the itertools library
+import json  # Import the json library
+import multiprocessing  # Import the multiprocessing library
+import os  # Import the os library
+import sys  # Import the sys library
+import time  # Import the time library
+import numpy  # Import the numpy library
+from simulation import ENEMY_ROSTER, RULES, TICK_MS, Autopilot, NightBatch  # Import the game rules, the bot and the batch of nights
+
+PLAYERS = ["autopilot", "idle"]  # Bot that plays like simulation.py's Autopilot, or nobody at all
+CAUSES = {f"jumpscare:{entry['name']}": entry["name"] for entry in ENEMY_ROSTER}  # Enemy behind each kind of death
+
+def parse_setting(text):
+    """Parse "name=value,value" into (name, [values]). "10000:20000" is a (min, max) range."""
+    name, _, values = text.partition("=")
+    if name not in RULES and name != "reaction_ms":
+        raise argparse.ArgumentTypeError(f"unknown setting {name!r}, choose from {', '.join(list(RULES) + ['reaction_ms'])}")
+    default = RULES.get(name, 0.0)  # reaction_ms may be a fraction of a millisecond
+    ranged = isinstance(default, tuple)  # (min, max) settings take "min:max" values
+    kind = type(default[0] if ranged else default)
+    def number(value):
+        parsed = float(value) if "." in value else int(value)
+        if kind is int and isinstance(parsed, float):
+            raise argparse.ArgumentTypeError(f"{name} takes whole numbers, not {value!r}")
+        return parsed
+    parsed = []
+    for value in values.split(","):
+        if value.count(":") != (1 if ranged else 0):
+            raise argparse.ArgumentTypeError(f"{name} takes {'min:max ranges' if ranged else 'single numbers'}, not {value!r}")
+        parsed.append([number(part) for part in value.split(":")] if ranged else number(value))
+    return name, parsed
+
+def grid(settings):
+    """Return every combination of the swept settings as a list of dictionaries."""
+    names = [name for name, _ in settings]
+    return [dict(zip(names, values)) for values in itertools.product(*(values for _, values in settings))]
+
+def point_key(point, player):
+    """Return a string identifying a grid point and player, used to group and resume runs."""
+    return json.dumps({"player": player, **point}, sort_keys=True)
+
+def run_batch(task):
+    """Simulate a batch of nights of a grid point side by side and return their results (runs in a worker process)."""
+    point, player, seeds = task
+    rules = {name: value for name, value in point.items() if name in RULES}
+    bots = [Autopilot(point.get("reaction_ms", 0)) if player == "autopilot" else None for _ in seeds]
+    return [{"point": point, "player": player, **result} for result in NightBatch(seeds, bots, rules=rules).run()]
+
+def batches(points, player, seeds, done, size):
+    """Split the nights of every grid point not in done into tasks of up to size seeds."""
+    tasks = []
+    for point in points:
+        todo = [seed for seed in seeds if (point_key(point, player), seed) not in done]
+        tasks += [(point, player, todo[start:start + size]) for start in range(0, len(todo), size)]
+    return tasks
+
+def read_results(path):
+    """Return the results already in the append-only results file."""
+    if not os.path.exists(path):
+        return []
+    results = []
+    with open(path) as file:
+        for line in file:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                pass  # Line cut short when a sweep was killed mid-write
+    return results
+
+def aggregate(results):
+    """Group results by grid point and return win rate, death causes, score and survival statistics for each."""
+    groups = {}
+    for result in results:
+        groups.setdefault(point_key(result["point"], result["player"]), []).append(result)
+    summary = []
+    for key, runs in groups.items():
+        outcomes = [run["result"] for run in runs]
+        scores = numpy.array([run["score"] for run in runs])
+        minutes = numpy.array([run["ticks"] for run in runs]) * TICK_MS / 60000
+        summary.append({
+            "point": json.loads(key),
+            "nights": len(runs),
+            "win_rate": outcomes.count("win") / len(runs),
+            **{f"{cause}_deaths": outcomes.count(result) / len(runs) for result, cause in CAUSES.items()},
+            "timeouts": outcomes.count("timeout") / len(runs),
+            "score_p10_p50_p90": [float(value) for value in numpy.percentile(scores, [10, 50, 90])],
+            "score_mean": float(scores.mean()),
+            "minutes_mean": float(minutes.mean()),
+        })
+    return summary
+
+def print_summary(summary):
+    """Print the aggregated results as a table."""
+    causes = list(CAUSES.values())
+    print(f"{'nights':>7}{'win':>7}" + "".join(f"{cause:>{max(len(cause) + 2, 7)}}" for cause in causes) + f"{'score p10/p50/p90':>20}{'minutes':>9}  point")
+    for row in summary:
+        scores = "/".join(f"{value:.0f}" for value in row["score_p10_p50_p90"])
+        point = ", ".join(f"{name}={value}" for name, value in row["point"].items())
+        deaths = "".join(f"{row[f'{cause}_deaths']:>{max(len(cause) + 2, 7)}.0%}" for cause in causes)
+        print(f"{row['nights']:>7}{row['win_rate']:>7.0%}{deaths}{scores:>20}{row['minutes_mean']:>9.1f}  {point}")
+
+def main(argv=None):
+    """Simulate nights for every combination of the swept settings on all cores and summarise the results."""
+    parser = argparse.ArgumentParser(description="Sweep difficulty settings over thousands of simulated nights.",
+                                     epilog=f"settings: {', '.join(RULES)}, reaction_ms (bot only)")
+    parser.add_argument("--set", dest="settings", type=parse_setting, action="append", default=[], metavar="NAME=V1,V2",
+                        help="values to sweep, e.g. win_score=120,143 or enemy_cooldown=8000:16000,10000:20000")
+    parser.add_argument("--nights", type=int, default=100, help="nights per combination (seeds are shared between combinations)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first night")
+    parser.add_argument("--player", choices=PLAYERS, default="autopilot", help="who plays the nights")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes to run nights in")
+    parser.add_argument("--batch", type=int, default=50, help="nights each worker simulates side by side per task")
+    parser.add_argument("--results", default="sweep_results.jsonl", help="append-only file of per-night results")
+    parser.add_argument("--summary", help="also write the aggregated results to this JSON file")
+    parser.add_argument("--aggregate-only", action="store_true", help="don't simulate, only summarise the results file")
+    args = parser.parse_args(argv)
+
+    points = grid(args.settings)
+    if not args.aggregate_only:
+        # Nights already in the results file (from an interrupted sweep) are not run again
+        done = {(point_key(result["point"], result["player"]), result["seed"]) for result in read_results(args.results)}
+        tasks = batches(points, args.player, range(args.seed, args.seed + args.nights), done, max(args.batch, 1))
+        total = sum(len(seeds) for _, _, seeds in tasks)
+        print(f"{len(points)} combinations x {args.nights} nights: {total} to run on {args.workers} processes")
+        start = time.perf_counter()
+        count = 0
+        with open(args.results, "a") as file, multiprocessing.Pool(args.workers) as pool:
+            for results in pool.imap_unordered(run_batch, tasks):
+                file.writelines(json.dumps(result) + "\n" for result in results)
+                file.flush()  # Every finished batch is kept even if the sweep is interrupted
+                count += len(results)
+                print(f"{count}/{total} nights, {count / (time.perf_counter() - start):.1f} nights/s", file=sys.stderr)
+
+    wanted = {point_key(point, args.player) for point in points}
+    results = [result for result in read_results(args.results)
+               if args.aggregate_only or point_key(result["point"], result["player"]) in wanted]
+    summary = aggregate(results)
+    print_summary(summary)
+    if args.summary:
+        with open(args.summary, "w") as file:
+            json.dump(summary, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import pygame  # Import the pygame library
+from collections import OrderedDict  # Ordered dictionary used to track the least recently used texts
+
+class GlyphAtlas:
+    """The digits of a font rendered once into one surface, used to compose numbers that change often."""
+    CHARS = "0123456789"  # Characters kept in the atlas
+
+    def __init__(self, font, antialias, colour):
+        glyphs = [font.render(char, antialias, colour) for char in self.CHARS]  # Render each digit once
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height), pygame.SRCALPHA)
+        self.areas = {}  # Area of each digit in the atlas surface
+        x = 0
+        for char, glyph in zip(self.CHARS, glyphs):
+            self.surface.blit(glyph, (x, 0), special_flags=copy_flags(glyph))
+            self.areas[char] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def compose(self, prefix_surface, digits):
+        """Return a new surface with prefix_surface followed by the digits copied out of the atlas."""
+        width = prefix_surface.get_width() + sum(self.areas[char].width for char in digits)
+        surface = pygame.Surface((width, max(self.height, prefix_surface.get_height())), pygame.SRCALPHA)
+        surface.blit(prefix_surface, (0, 0), special_flags=copy_flags(prefix_surface))
+        x = prefix_surface.get_width()
+        for char in digits:
+            area = self.areas[char]
+            surface.blit(self.surface, (x, 0), area, special_flags=pygame.BLEND_RGBA_MAX)
+            x += area.width
+        return surface
+
+def copy_flags(surface):
+    """Return the blit flags that copy surface onto a transparent surface without darkening antialiased edges."""
+    # Per-pixel alpha text is copied with BLEND_RGBA_MAX instead of blended; colorkey text can be blitted normally
+    return pygame.BLEND_RGBA_MAX if surface.get_flags() & pygame.SRCALPHA else 0
+
+class TextCache:
+    """Rendered text surfaces kept in a size-capped LRU cache so labels are only rendered when they change."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries  # Most text surfaces kept at once
+        self.surfaces = OrderedDict()  # Rendered texts, least recently used first
+        self.atlases = {}  # Digit atlases by (font, antialias, colour)
+        self.hits = 0  # Number of texts served from the cache
+        self.misses = 0  # Number of texts that had to be rendered or composed
+
+    def get(self, key):
+        """Return the cached surface for key, or None."""
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)  # Mark as most recently used
+            self.hits += 1
+        else:
+            self.misses += 1
+        return surface
+
+    def store(self, key, surface):
+        """Add a surface and drop the least recently used one if over the cap."""
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def render(self, font, text, antialias, colour):
+        """Return font.render(text, antialias, colour), rendering it only the first time."""
+        key = (font, text, antialias, colour)
+        surface = self.get(key)
+        if surface is None:
+            surface = self.store(key, font.render(text, antialias, colour))
+        return surface
+
+    def render_number(self, font, prefix, number, antialias, colour):
+        """Return the text prefix followed by number, composed from the cached prefix and digit atlas."""
+        text = f"{prefix}{number}"
+        key = (font, text, antialias, colour)
+        surface = self.get(key)
+        if surface is None:
+            digits = str(number)
+            if not digits.isdigit():
+                return self.store(key, font.render(text, antialias, colour))  # Negative numbers: render as usual
+            atlas = self.atlases.get((font, antialias, colour))
+            if atlas is None:
+                atlas = self.atlases[(font, antialias, colour)] = GlyphAtlas(font, antialias, colour)
+            surface = self.store(key, atlas.compose(self.render(font, prefix, antialias, colour), digits))
+        return surface
+
+    def stats(self):
+        """Return the cache counters as a dictionary."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.surfaces),
+        }